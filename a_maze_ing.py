@@ -1,21 +1,32 @@
+from srcs.mazegen.batch import generate_one
 from srcs.mazegen.config_parser import ConfigParser
-from srcs.maze.maze import App
 from srcs.mazegen.maze_gen import MazeGen
+from srcs.mazegen.eller import EllerGen
 from sys import argv
 
 
 if (__name__ == "__main__"):
-    if (len(argv) < 2):
+    args = [arg for arg in argv[1:] if arg != "--headless"]
+    if (len(args) < 1):
         exit(1)
     try:
-        parser = ConfigParser(argv[1])
+        parser = ConfigParser(args[0])
         config = parser.extract()
         if (config is None):
             raise ValueError("The config is invalid")
-        maze = MazeGen(config)
-        maze.dfs()
-        maze.export_maze_file()
-        m = App(maze.export_maze_obj(), config)
+        headless = "--headless" in argv or config.display == "none"
+        if (headless):
+            if (config.algorithm == "eller"):
+                EllerGen(config).export_maze_file()
+            elif (config.cache_dir is not None):
+                generate_one(config)
+            else:
+                maze = MazeGen(config)
+                maze.generate()
+                maze.export_maze_file()
+            exit(0)
+        from srcs.maze.maze import App
+        m = App(generate_one(config), config)
         m.run()
         m.destroy()
     except Exception as e:
@@ -0,0 +1,88 @@
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import MazeGen, AStar
+
+
+class LinearAStar(AStar):
+    """Reference A* keeping the open set in a plain list, as it used to be
+    """
+
+    def __init__(self, maze: MazeGen) -> None:
+        self.open_lst: list[int] = []
+        super().__init__(maze)
+
+    def open_node(self, node: int) -> None:
+        """Append the node to the open list if it is not there yet"""
+        if node not in self.open_lst:
+            self.open_lst.append(node)
+        self.order[node] = 0
+
+    def best_node(self) -> int | None:
+        """Linear scan of the open list"""
+        if not self.open_lst:
+            return None
+        best_node = self.open_lst[0]
+        for node in self.open_lst[1:]:
+            if self.f[best_node] > self.f[node]:
+                best_node = node
+        return best_node
+
+    def close_node(self, current: int) -> None:
+        """Remove the node from the open list"""
+        self.open_lst.remove(current)
+        del self.order[current]
+        self.closed.add(current)
+
+
+def build(size: int) -> MazeGen:
+    """Generate an imperfect square maze of size * size cells
+
+    Args:
+    size: The side of the maze
+
+    Returns:
+    The generated maze
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=False, seed=42))
+    gen.dfs()
+    return gen
+
+
+def open_floor(size: int) -> MazeGen:
+    """Build a size * size room without inner walls, where the open set
+    grows with the frontier instead of staying a handful of corridor ends
+
+    Args:
+    size: The side of the room
+
+    Returns:
+    The room
+    """
+    gen = build(size)
+    for y in range(size):
+        for x in range(size):
+            gen.dig_wall(gen.index((x, y)), 1 if x + 1 < size else 3)
+            gen.dig_wall(gen.index((x, y)), 2 if y + 1 < size else 0)
+    return gen
+
+
+def timed(solver: type[AStar], gen: MazeGen) -> float:
+    """Time a full solve of gen with the given solver class"""
+    start = perf_counter()
+    solver(gen).solve(gen)
+    return perf_counter() - start
+
+
+if (__name__ == "__main__"):
+    for name, builder in [("maze", build), ("open floor", open_floor)]:
+        print(name)
+        print(f"{'cells':>10} {'heap (s)':>10} {'linear (s)':>11} "
+              f"{'ratio':>7}")
+        for size in [50, 100, 200, 400]:
+            gen = builder(size)
+            heap = timed(AStar, gen)
+            linear = timed(LinearAStar, gen)
+            print(f"{size * size:>10} {heap:>10.4f} {linear:>11.4f} "
+                  f"{linear / heap:>7.1f}")
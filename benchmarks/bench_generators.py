@@ -0,0 +1,40 @@
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.generators import GENERATORS
+from srcs.mazegen.maze_gen import MazeGen
+
+
+def throughput(algorithm: str, size: int, batch: int = 0) -> float:
+    """Generate a perfect size * size maze
+
+    Args:
+    algorithm: The generator name
+    size: The side of the maze
+    batch: Generate it through generate_steps, pausing every batch dug
+    walls, when not 0
+
+    Returns:
+    The generated cells per second
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42, algorithm=algorithm))
+    start = perf_counter()
+    if (batch):
+        for _ in gen.generate_steps(batch):
+            pass
+    else:
+        gen.generate()
+    return size * size / (perf_counter() - start)
+
+
+if (__name__ == "__main__"):
+    print(f"{'cells':>10}" + "".join(f"{name:>12}" for name in GENERATORS)
+          + "  (cells/sec)")
+    for size in [50, 100, 200, 400]:
+        print(f"{size * size:>10}" + "".join(
+            f"{throughput(name, size):>12.0f}" for name in GENERATORS))
+    print("stepwise, pausing every 32 dug walls")
+    for size in [50, 100, 200, 400]:
+        print(f"{size * size:>10}" + "".join(
+            f"{throughput(name, size, 32):>12.0f}" for name in GENERATORS))
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Run a statement in a fresh interpreter with -X importtime
+
+    Args:
+    statement: The python statement to run
+
+    Returns:
+    The cumulative import time of every imported module, in microseconds
+    """
+    run = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                          statement], capture_output=True, text=True)
+    if run.returncode:
+        raise SystemExit(f"{statement} failed: "
+                         f"{run.stderr.splitlines()[-1]}")
+    times: dict[str, int] = {}
+    for line in run.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+if (__name__ == "__main__"):
+    times = import_times("import a_maze_ing")
+    top = sorted(times.items(), key=lambda item: -item[1])[:5]
+    for name, us in top:
+        print(f"{us / 1000:>8.1f} ms  {name}")
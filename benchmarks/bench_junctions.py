@@ -0,0 +1,45 @@
+from random import Random
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.junctions import JunctionGraph
+from srcs.mazegen.maze_gen import AStar, MazeGen
+
+QUERIES = 20
+
+
+def compare(size: int) -> None:
+    """Solve an imperfect size * size maze with A* over the cells, then
+    over its junction graph, and time random queries on the same graph
+
+    Args:
+    size: The side of the maze
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=False, seed=42))
+    gen.generate()
+    start = perf_counter()
+    path = AStar(gen).solve(gen)
+    astar = perf_counter() - start
+    start = perf_counter()
+    graph = JunctionGraph.of(gen)
+    build = perf_counter() - start
+    start = perf_counter()
+    contracted = graph.solve(gen.entry, gen.exit)
+    solve = perf_counter() - start
+    assert len(contracted or "") == len(path or "")
+    rng = Random(0)
+    start = perf_counter()
+    for _ in range(QUERIES):
+        graph.solve((rng.randrange(size), rng.randrange(size)),
+                    (rng.randrange(size), rng.randrange(size)))
+    query = (perf_counter() - start) / QUERIES
+    print(f"{size * size:>10} {len(graph.cells) / size / size:>6.0%} "
+          f"{astar:>9.3f} {build:>9.3f} {solve:>9.3f} {query:>9.3f}")
+
+
+if (__name__ == "__main__"):
+    print(f"{'cells':>10} {'nodes':>6} {'astar (s)':>9} {'build (s)':>9} "
+          f"{'solve (s)':>9} {'query (s)':>9}")
+    for size in [100, 300, 1000]:
+        compare(size)
@@ -0,0 +1,128 @@
+from time import perf_counter
+from typing import Tuple
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import MazeGen
+from srcs.maze.lod import (HAS_NUMPY, _numpy_pool, _python_pool, pyramid,
+                           top_level)
+from srcs.maze.renderer import (BG, ENTRY, EXIT, LOGO, WALL, ChunkCache,
+                                blit_tiles, cell_keys, expand,
+                                palette_tables, render_view, tile_set)
+from srcs.maze.snapshot import export_image
+
+
+def layer(size: int, cell_size: int) -> Tuple[bytearray, float]:
+    """Rasterize a size * size maze in a palette layer
+
+    Args:
+    size: The side of the maze
+    cell_size: The cell size in pixel
+
+    Returns:
+    The palette layer and the time spent rasterizing it
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42))
+    gen.generate()
+    maze = gen.export_maze_obj()
+    keys = cell_keys(maze.maze, size, size, maze.entry, maze.exit)
+    side = size * cell_size + 1
+    pixels = bytearray(side * side)
+    start = perf_counter()
+    tiles = tile_set(cell_size, bytes((BG,)), bytes((WALL,)),
+                     (bytes((LOGO,)), bytes((ENTRY,)), bytes((EXIT,))))
+    blit_tiles(pixels, side, keys, tiles, cell_size, 1, side, side)
+    return pixels, perf_counter() - start
+
+
+def pan(size: int, cell_size: int, width: int, height: int) -> None:
+    """Pan a view over a size * size maze, first cold then from the cache
+
+    Args:
+    size: The side of the maze
+    cell_size: The cell size in pixel
+    width, height: The view size in pixel
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42))
+    gen.generate()
+    maze = gen.export_maze_obj()
+    keys = cell_keys(maze.maze, size, size, maze.entry, maze.exit)
+    view = bytearray(width * height)
+    cache = ChunkCache(4 * width * height)
+    origins = [(-x * 37, -x * 23) for x in range(40)]
+    for run in ["cold", "warm"]:
+        start = perf_counter()
+        for origin in origins:
+            render_view(view, width, height, origin, keys, cell_size, cache)
+        spent = (perf_counter() - start) / len(origins)
+        print(f"pan {size}x{size} cell={cell_size} {width}x{height} {run}"
+              f" {spent * 1000:.1f} ms/frame, cache {cache.size >> 20} MB")
+        origins.reverse()
+
+
+def lod(size: int, width: int, height: int) -> None:
+    """Build the levels of detail of a size * size maze, then time the
+    pooling with big ints against numpy when it is installed
+
+    Args:
+    size: The side of the maze
+    width, height: The view size in pixel
+    """
+    maze = "\n".join(["5A" * (size // 2)] * size)
+    depth = top_level(size, size, width, height)
+    start = perf_counter()
+    levels = pyramid(maze, size, size, "", (0, 0), (1, 1), depth)
+    print(f"lod {size}x{size} {len(levels)} levels"
+          f" {(perf_counter() - start) * 1000:.0f} ms")
+    pools = [("big ints", _python_pool)]
+    if HAS_NUMPY:
+        pools.append(("numpy", _numpy_pool))
+    for name, halve in pools:
+        start = perf_counter()
+        pooled = [halve(level) for level in levels[:-1]]
+        spent = perf_counter() - start
+        if (pooled != levels[1:]):
+            raise SystemExit(f"{name} pooling differs")
+        print(f"lod pool {name:<8} {spent * 1000:.0f} ms")
+
+
+def snapshot(size: int, cell_size: int) -> None:
+    """Export a size * size maze as PNG and PPM images
+
+    Args:
+    size: The side of the maze
+    cell_size: The cell size in pixel
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42))
+    gen.generate()
+    maze = gen.export_maze_obj()
+    side = size * cell_size + 1
+    for file in ["/tmp/bench_snapshot.png", "/tmp/bench_snapshot.ppm"]:
+        start = perf_counter()
+        export_image(maze, file, cell_size)
+        spent = perf_counter() - start
+        print(f"snapshot {size}x{size} cell={cell_size} {file[-3:]}"
+              f" {spent * 1000:.0f} ms ({side * side / spent / 1e6:.0f}"
+              f" Mpixel/s)")
+
+
+if (__name__ == "__main__"):
+    for size, cell_size in [(50, 15), (250, 3), (250, 15), (250, 30)]:
+        side = size * cell_size + 1
+        pixels, draw = layer(size, cell_size)
+        addr = bytearray(side * side * 4)
+        start = perf_counter()
+        expand(pixels, side, side, palette_tables(
+            [0x000000FF, 0xFFFFFFFF, 0xE74C3CFF, 0xC0C0C0FF, 0x00FF00FF,
+             0xFF0000FF]), addr, side * 4)
+        paint = perf_counter() - start
+        print(f"{size}x{size} cell={cell_size:<3} draw {draw * 1000:>7.1f} ms"
+              f"  recolor {paint * 1000:>6.1f} ms"
+              f"  ({len(addr) / paint / 2**20:.0f} MB/s)")
+    pan(250, 30, 960, 490)
+    lod(5000, 960, 490)
+    snapshot(1000, 4)
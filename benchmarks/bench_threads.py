@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import MazeGen
+
+SHAPES = ["rectangle", "square", "circle", "donut", "diamond", "ellipse"]
+ALGORITHMS = ["dfs", "kruskal", "wilson"]
+
+
+def configs(count: int) -> list[Config]:
+    """Build seeded configs covering every shape, algorithm and perfection
+
+    Args:
+    count: The number of configs
+
+    Returns:
+    The configs
+    """
+    return [Config(width=30 + i % 17, height=30 + i % 13, entry=(1, 1),
+                   exit=(20, 25), output_file="/dev/null",
+                   perfect=bool(i % 2), seed=i + 1,
+                   shape=SHAPES[i % len(SHAPES)],
+                   algorithm=ALGORITHMS[i % len(ALGORITHMS)])
+            for i in range(count)]
+
+
+def render(config: Config) -> str:
+    """Generate and solve a maze
+
+    Args:
+    config: The maze config
+
+    Returns:
+    The maze file content
+    """
+    gen = MazeGen(config)
+    gen.generate()
+    return gen.str_repr(False)
+
+
+if (__name__ == "__main__"):
+    todo = configs(300)
+    start = perf_counter()
+    for config in todo:
+        render(config)
+    print(f"serial   {perf_counter() - start:.3f}s")
+    for workers in [2, 8, 32]:
+        start = perf_counter()
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(render, todo))
+        print(f"threads={workers:<3}{perf_counter() - start:.3f}s")
@@ -0,0 +1,29 @@
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import AStar, MazeGen, TreeSolver
+
+
+def compare(size: int) -> None:
+    """Solve a perfect size * size dfs maze with A* and from its parents
+
+    Args:
+    size: The side of the maze
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42))
+    gen.generate()
+    start = perf_counter()
+    path = AStar(gen).solve(gen)
+    astar = perf_counter() - start
+    start = perf_counter()
+    tree = TreeSolver(gen).solve(gen)
+    parents = perf_counter() - start
+    assert tree == path
+    print(f"{size * size:>10} cells  path {len(tree or ''):>7}"
+          f"  astar {astar * 1000:>8.2f} ms  tree {parents * 1000:>7.3f} ms")
+
+
+if (__name__ == "__main__"):
+    for size in [100, 300, 1000]:
+        compare(size)
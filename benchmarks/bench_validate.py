@@ -0,0 +1,32 @@
+from time import perf_counter
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import Maze, MazeGen
+
+
+def build(size: int) -> None:
+    """Build a size * size maze object, validated then trusted
+
+    Args:
+    size: The side of the maze
+    """
+    gen = MazeGen(Config(width=size, height=size, entry=(0, 0),
+                         exit=(size - 1, size - 1), output_file="/dev/null",
+                         perfect=True, seed=42))
+    gen.generate()
+    grid, path = gen.grid_repr(), gen.solve()
+    fields = {"maze": grid, "entry": gen.entry, "exit": gen.exit,
+              "path": path, "nbr_cols": size, "nbr_rows": size,
+              "seed": gen.seed}
+    start = perf_counter()
+    Maze(**fields)
+    validated = perf_counter() - start
+    start = perf_counter()
+    Maze.trusted(**fields)
+    trusted = perf_counter() - start
+    print(f"{size * size:>10} cells  validated {validated * 1000:>7.2f} ms"
+          f"  trusted {trusted * 1000:>7.3f} ms")
+
+
+if (__name__ == "__main__"):
+    for size in [100, 500, 1000]:
+        build(size)
@@ -0,0 +1,12 @@
+from benchmarks.bench_import import import_times
+
+GUI_MODULES = ["mlx", "srcs.maze.maze", "srcs.maze.maze_display",
+               "srcs.maze.help_display"]
+
+
+if (__name__ == "__main__"):
+    times = import_times("import a_maze_ing")
+    loaded = [name for name in GUI_MODULES if name in times]
+    if loaded:
+        raise SystemExit(f"headless import pulls display modules: {loaded}")
+    print("no display module imported at startup")
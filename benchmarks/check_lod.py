@@ -0,0 +1,20 @@
+from random import Random
+from srcs.maze.lod import HAS_NUMPY, _numpy_pool, _python_pool
+
+SIZES = [1, 2, 3, 4, 7, 10, 31]
+
+
+if (__name__ == "__main__"):
+    if not HAS_NUMPY:
+        raise SystemExit("numpy is not installed, nothing to compare")
+    rng = Random(42)
+    bad = []
+    for width in SIZES:
+        for height in SIZES:
+            level = (bytes(rng.randrange(32) for _ in range(width * height)),
+                     width, height)
+            if (_numpy_pool(level) != _python_pool(level)):
+                bad.append((width, height))
+    if bad:
+        raise SystemExit(f"numpy and python pooling differ: {bad}")
+    print("numpy and python pooling are identical")
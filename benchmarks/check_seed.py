@@ -0,0 +1,35 @@
+from tempfile import TemporaryDirectory
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_cache import MazeCache
+from srcs.mazegen.maze_gen import MazeGen
+
+
+def config(seed: int | None, cache_dir: str) -> Config:
+    """Build a small cached config
+
+    Args:
+    seed: The config seed
+    cache_dir: The cache directory
+
+    Returns:
+    The config
+    """
+    return Config(width=20, height=15, entry=(0, 0), exit=(19, 14),
+                  output_file="/dev/null", perfect=True, seed=seed,
+                  cache_dir=cache_dir)
+
+
+if (__name__ == "__main__"):
+    with TemporaryDirectory() as directory:
+        for seed in (None, 0):
+            conf = config(seed, directory)
+            drawn = {MazeGen(conf).seed for _ in range(4)}
+            if len(drawn) == 1:
+                raise SystemExit(f"SEED={seed} does not draw random seeds")
+            if MazeCache.of(conf) is not None:
+                raise SystemExit(f"SEED={seed} is cached but generated "
+                                 "with a random seed")
+        conf = config(7, directory)
+        if MazeGen(conf).seed != 7 or MazeCache.of(conf) is None:
+            raise SystemExit("SEED=7 is not kept or not cached")
+    print("unseeded configs are random and never cached")
@@ -0,0 +1,16 @@
+from srcs.mazegen.shapes import HAS_NUMPY, _numpy_mask, _python_mask
+
+KINDS = ["circle", "hole", "diamond", "ellipse"]
+SIZES = [1, 2, 3, 4, 7, 10, 31]
+
+
+if (__name__ == "__main__"):
+    if not HAS_NUMPY:
+        raise SystemExit("numpy is not installed, nothing to compare")
+    bad = [(kind, width, height) for kind in KINDS for width in SIZES
+           for height in SIZES
+           if _numpy_mask(kind, width, height)
+           != _python_mask(kind, width, height)]
+    if bad:
+        raise SystemExit(f"numpy and python shape masks differ: {bad}")
+    print("numpy and python shape masks are identical")
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import MazeGen
+from benchmarks.bench_threads import configs, render
+
+WORKERS = 8
+
+
+def drawn(config: Config) -> tuple[int, str]:
+    """Generate and solve a maze, keeping the seed MazeGen used
+
+    Args:
+    config: The maze config
+
+    Returns:
+    The seed and the maze file content
+    """
+    gen = MazeGen(config)
+    gen.generate()
+    return gen.seed, gen.str_repr(False)
+
+
+if (__name__ == "__main__"):
+    todo = configs(60)
+    serial = [render(c) for c in todo]
+    with ThreadPoolExecutor(WORKERS) as pool:
+        threaded = list(pool.map(render, todo))
+    if threaded != serial:
+        bad = sum(a != b for a, b in zip(threaded, serial))
+        raise SystemExit(f"{bad} mazes differ from the serial run")
+    # SEED=0 and no SEED draw a random seed: they cannot match a serial
+    # run, but each one must be replayed by the seed it drew
+    unseeded = [c.model_copy(update={"seed": seed})
+                for c in todo[:12] for seed in (0, None)]
+    with ThreadPoolExecutor(WORKERS) as pool:
+        runs = list(pool.map(drawn, unseeded))
+    for conf, (seed, maze) in zip(unseeded, runs):
+        if not seed:
+            raise SystemExit(f"SEED={conf.seed} kept a zero seed")
+        if render(conf.model_copy(update={"seed": seed})) != maze:
+            raise SystemExit(f"SEED={conf.seed} maze is not replayed by "
+                             f"its drawn seed {seed}")
+    print("threaded mazes are identical to the serial ones, unseeded "
+          "ones replay from their drawn seed")
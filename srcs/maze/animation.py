@@ -0,0 +1,67 @@
+from time import monotonic
+from typing import Iterator, Tuple
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_gen import AStar, Maze, MazeGen
+
+STEP_BATCH = 32
+
+
+class Animation:
+    """
+    The Animation obj generates then solves a maze a few steps at a time,
+    so the display can show every dug wall and explored cell as it goes
+    The cells explored so far are kept in self.explored, for redraws
+
+    Args:
+    config: The maze config
+    batch: The number of dug walls or explored cells of a step
+    """
+
+    def __init__(self, config: Config, batch: int = STEP_BATCH) -> None:
+        self.config = config
+        self.gen = MazeGen(config)
+        self.maze: Maze | None = None
+        self.stamped = False
+        self.explored: list[int] = []
+        self.steps = self.run(batch)
+
+    def run(self, batch: int) -> Iterator[Tuple[bool, list[int]]]:
+        """Generate then solve the maze, building self.maze at the end
+
+        Args:
+        batch: The number of dug walls or explored cells of a step
+
+        Returns:
+        An iterator over the steps, each one telling whether it comes from
+        the solver and which cells it changed
+        """
+        for cells in self.gen.generate_steps(batch):
+            yield False, cells
+        solver = AStar(self.gen)
+        for cells in solver.solve_steps(self.gen, batch):
+            yield True, cells
+        path = solver.find_path(self.gen) if solver.found else " "
+        self.maze = self.gen.maze_obj(self.gen.grid_repr(), path)
+
+    def advance(self, budget: float) -> Tuple[list[int], list[int], bool]:
+        """Run steps until the time budget is spent or the maze is done
+        The first step stamps the whole grid, it is always run alone
+
+        Args:
+        budget: The time allowed, in seconds
+
+        Returns:
+        The cells changed by the generator, the cells explored by the
+        solver and whether the first step was run
+        """
+        dug: list[int] = []
+        explored: list[int] = []
+        end = monotonic() + budget
+        stamped = not self.stamped
+        for solving, cells in self.steps:
+            (explored if solving else dug).extend(cells)
+            if (stamped or monotonic() > end):
+                break
+        self.stamped = True
+        self.explored += explored
+        return dug, explored, stamped
@@ -30,12 +30,19 @@ class HelpDisplay:
         self.raw_buts: list[RawButton] = [
             {
                 "label": "r: Generate a new maze",
-                "action": lambda: display.regen_maze(display.config)
+                "action": lambda: display.next_maze("r")
             },
             {
                 "label": "t: Generate a new random maze",
-                "action": lambda: display.regen_maze(
-                    display.gen_random_config())
+                "action": lambda: display.next_maze("t")
+            },
+            {
+                "label": "g: Animate a new maze",
+                "action": display.start_animation
+            },
+            {
+                "label": "i: Toggle stats",
+                "action": display.toggle_stats
             },
             {
                 "label": "x: export current maze config",
@@ -114,17 +121,21 @@ class HelpDisplay:
         elif (keycode == 112):  # 'p'
             self.display.toggle_path()
         elif (keycode == 114):  # 'r'
-            self.display.regen_maze(self.display.config)
+            self.display.next_maze("r")
         elif (keycode == 119):  # 'w'
             self.display.change_wall_color()
         elif (keycode == 108):  # 'l'
             self.display.change_logo_color()
         elif (keycode == 116):  # 't'
-            self.display.regen_maze(self.display.gen_random_config())
+            self.display.next_maze("t")
         elif (keycode == 120):  # 'x'
             self.display.export_config()
         elif (keycode == 111):  # 'o'
             self.display.reset_maze()
+        elif (keycode == 103):  # 'g'
+            self.display.start_animation()
+        elif (keycode == 105):  # 'i'
+            self.display.toggle_stats()
         elif (keycode == 61):  # '='
             self.display.ratio += 1/10
             self.display.recreate_win()
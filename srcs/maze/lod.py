@@ -0,0 +1,234 @@
+from importlib.util import find_spec
+from srcs.maze.renderer import BG, ENTRY, EXIT, LOGO, PATH, WALL
+from typing import Iterable, Tuple
+
+CELL_WALL = 1
+CELL_LOGO = 2
+CELL_PATH = 4
+CELL_ENTRY = 8
+CELL_EXIT = 16
+
+HAS_NUMPY: bool = find_spec("numpy") is not None
+
+HEX_DIGITS = b"0123456789ABCDEF "
+CELL_FLAGS: bytes = bytes.maketrans(HEX_DIGITS,
+                                    bytes(15) + bytes((CELL_LOGO, 0)))
+# The wall a cell gives the pixel on each side of it, N, E, S, W, indexed
+# by its hexadecimal digit
+SIDE_FLAGS: list[bytes] = [
+    bytes.maketrans(HEX_DIGITS, bytes(CELL_WALL * (value >> side & 1)
+                                      for value in range(16)) + b"\x00")
+    for side in range(4)]
+
+Level = Tuple[bytes, int, int]
+
+
+def raster(lines: Iterable[bytes], cols: int, rows: int) -> bytearray:
+    """Rasterize the walls of a maze, one row of cells at a time
+    A cell is the pixel (2x + 1, 2y + 1), the pixels between two cells
+    hold the wall or the passage joining them, and a corner is a wall when
+    a wall meets it, as the tiles draw them
+
+    Args:
+    lines: The hexadecimal lines of the maze
+    cols, rows: The maze size
+
+    Returns:
+    The 2 * rows + 1 rows of 2 * cols + 1 pixels
+    """
+    north, east, south, west = SIDE_FLAGS
+    width = 2 * cols + 1
+    pixels = bytearray(width * (2 * rows + 1))
+    lines = iter(lines)
+    above = sides = 0
+    for y in range(rows + 1):
+        line = next(lines, b"")[:cols].ljust(cols) if (y < rows) \
+            else b" " * cols
+        # Rows of pixels as big ints, a byte shift moving them one column
+        edges = above | int.from_bytes(line.translate(north), "big")
+        below = int.from_bytes(line.translate(east), "big") \
+            | int.from_bytes(line.translate(west), "big") << 8
+        start = 2 * y * width
+        pixels[start:start + width:2] = \
+            (edges | edges << 8 | sides | below).to_bytes(cols + 1, "big")
+        pixels[start + 1:start + width:2] = edges.to_bytes(cols, "big")
+        if (y < rows):
+            start += width
+            pixels[start:start + width:2] = below.to_bytes(cols + 1, "big")
+            pixels[start + 1:start + width:2] = line.translate(CELL_FLAGS)
+        above = int.from_bytes(line.translate(south), "big")
+        sides = below
+    return pixels
+
+
+def occupancy(maze: str, cols: int, rows: int, path: str,
+              entry: Tuple[int, int], exit: Tuple[int, int]) -> Level:
+    """Compute the finest level of detail, the wall raster of the maze
+    with two pixels per cell, every pixel holding the flags of what is
+    there
+
+    Args:
+    maze: The maze, as hexadecimal lines
+    cols, rows: The maze size
+    path: The path directions
+    entry, exit: The entry and exit cells
+
+    Returns:
+    The level pixels and size
+    """
+    width, height = 2 * cols + 1, 2 * rows + 1
+    pixels = raster(maze.encode().split(b"\n"), cols, rows)
+    moves = {"N": -width, "S": width, "W": -1, "E": 1}
+    i = (2 * entry[1] + 1) * width + 2 * entry[0] + 1
+    for step in path:
+        move = moves.get(step, 0)
+        pixels[i + move] |= CELL_PATH
+        i += 2 * move
+        pixels[i] |= CELL_PATH
+    pixels[(2 * entry[1] + 1) * width + 2 * entry[0] + 1] |= CELL_ENTRY
+    pixels[(2 * exit[1] + 1) * width + 2 * exit[0] + 1] |= CELL_EXIT
+    return bytes(pixels), width, height
+
+
+def pool(level: Level) -> Level:
+    """Halve a level of detail, a pixel getting the flags of the 2 * 2
+    pixels under it, but being a wall only when three of them are, so
+    that passages win the ties and the coarser levels keep the floor
+    The last pixel of an odd row or column is repeated
+
+    Args:
+    level: The level pixels and size
+
+    Returns:
+    The next level pixels and size
+    """
+    if HAS_NUMPY:
+        return _numpy_pool(level)
+    return _python_pool(level)
+
+
+def _python_pool(level: Level) -> Level:
+    """Pure Python version of pool, used without numpy
+    Each pair of rows is pooled at once, their even and odd pixels as big
+    ints
+    """
+    pixels, width, height = level
+    half = (width + 1) // 2
+    walls = int.from_bytes(bytes((CELL_WALL,)) * half, "big")
+    out = bytearray()
+    for y in range(0, height, 2):
+        a = pixels[y * width:(y + 1) * width]
+        b = pixels[(y + 1) * width:(y + 2) * width] if y + 1 < height else a
+        if (width % 2):
+            a, b = a + a[-1:], b + b[-1:]
+        p, q, r, s = (int.from_bytes(a[0::2], "big"),
+                      int.from_bytes(a[1::2], "big"),
+                      int.from_bytes(b[0::2], "big"),
+                      int.from_bytes(b[1::2], "big"))
+        wall = (p & q & (r | s)) | (r & s & (p | q))
+        out += ((p | q | r | s) & ~walls | wall & walls).to_bytes(half, "big")
+    return bytes(out), half, (height + 1) // 2
+
+
+def _numpy_pool(level: Level) -> Level:
+    """Vectorized version of pool"""
+    import numpy as np
+    pixels, width, height = level
+    grid = np.frombuffer(pixels, np.uint8).reshape(height, width)
+    grid = np.pad(grid, ((0, height % 2), (0, width % 2)), "edge")
+    p, q, r, s = (grid[0::2, 0::2], grid[0::2, 1::2],
+                  grid[1::2, 0::2], grid[1::2, 1::2])
+    wall = (p & q & (r | s)) | (r & s & (p | q))
+    out = (p | q | r | s) & ~np.uint8(CELL_WALL) | wall & CELL_WALL
+    return out.tobytes(), (width + 1) // 2, (height + 1) // 2
+
+
+def top_level(cols: int, rows: int, width: int, height: int) -> int:
+    """Find the finest level of detail fitting in a view
+
+    Args:
+    cols, rows: The maze size
+    width, height: The view size in pixel
+
+    Returns:
+    The level, level 0 being the 2 * cols + 1 by 2 * rows + 1 wall raster
+    and each level halving the previous one
+    """
+    level = 0
+    while (-(-(2 * cols + 1) >> level) > width
+           or -(-(2 * rows + 1) >> level) > height):
+        level += 1
+    return level
+
+
+def pyramid(maze: str, cols: int, rows: int, path: str,
+            entry: Tuple[int, int], exit: Tuple[int, int],
+            depth: int) -> list[Level]:
+    """Build the levels of detail of a maze
+
+    Args:
+    maze: The maze, as hexadecimal lines
+    cols, rows: The maze size
+    path: The path directions
+    entry, exit: The entry and exit cells
+    depth: The coarsest level to build
+
+    Returns:
+    The levels, from the wall raster to the coarsest one
+    """
+    levels = [occupancy(maze, cols, rows, path, entry, exit)]
+    while (len(levels) <= depth):
+        levels.append(pool(levels[-1]))
+    return levels
+
+
+def level_table(show_path: bool) -> bytes:
+    """Build the table turning cell flags into palette indexes, the most
+    important thing in a pixel being shown
+
+    Args:
+    show_path: Whether the path is shown
+
+    Returns:
+    The translation table
+    """
+    table = bytearray(256)
+    for flags in range(32):
+        if (flags & CELL_EXIT):
+            table[flags] = EXIT
+        elif (flags & CELL_ENTRY):
+            table[flags] = ENTRY
+        elif (flags & CELL_PATH and show_path):
+            table[flags] = PATH
+        elif (flags & CELL_LOGO):
+            table[flags] = LOGO
+        elif (flags & CELL_WALL):
+            table[flags] = WALL
+        else:
+            table[flags] = BG
+    return bytes(table)
+
+
+def render_level(view: bytearray, width: int, height: int,
+                 origin: Tuple[int, int], level: Level,
+                 table: bytes) -> None:
+    """Draw the visible part of a level of detail on a palette layer
+
+    Args:
+    view: The palette layer, width * height bytes, drawn over entirely
+    width, height: The view size in pixel
+    origin: The position of the level top left corner in the view
+    level: The level pixels and size
+    table: The table turning cell flags into palette indexes
+    """
+    view[:] = bytes(len(view))
+    pixels, level_w, level_h = level
+    x0, y0 = max(0, -origin[0]), max(0, -origin[1])
+    x1 = min(level_w, width - origin[0])
+    y1 = min(level_h, height - origin[1])
+    if (x0 >= x1):
+        return
+    for y in range(y0, y1):
+        dst = (y + origin[1]) * width + origin[0]
+        view[dst + x0:dst + x1] = \
+            pixels[y * level_w + x0:y * level_w + x1].translate(table)
@@ -24,6 +24,15 @@ class App:
 
     def destroy(self) -> None:
         """Clean and free all memory"""
+        if (self.maze_ui.job is not None):
+            self.maze_ui.job.cancel()
+        self.maze_ui.prefetcher.cancel()
+        stats_file = self.maze_ui.config.stats_file
+        if (stats_file is not None):
+            try:
+                self.maze_ui.stats.dump(stats_file)
+            except OSError as e:
+                print(f"Error: {e}")
         self.m.mlx_destroy_window(self.mlx, self.help_ui.win)
         self.m.mlx_destroy_window(self.mlx, self.maze_ui.win)
         self.m.mlx_destroy_image(self.mlx, self.maze_ui.img)
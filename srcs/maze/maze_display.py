@@ -1,10 +1,26 @@
 from random import randint, choice
-from srcs.mazegen.maze_gen import MazeGen
 from math import ceil
+from time import monotonic
 from srcs.mazegen.config_parser import Config
 from mlx import Mlx
-from typing import Any, Tuple
+from typing import Any, Callable, Tuple
 from srcs.mazegen.maze_gen import Maze
+from srcs.maze.renderer import (FLOOR, PATH, ChunkCache, blit_cells,
+                                cell_keys, expand, expand_spans, fill_cells,
+                                merge_spans, palette, palette_tables,
+                                path_spans, render_view, update_keys)
+
+from srcs.maze.lod import Level, level_table, pyramid, render_level, \
+    top_level
+
+from srcs.maze.regen import Prefetcher, RegenJob
+from srcs.maze.animation import Animation
+from srcs.maze.stats import Stats, timed
+
+CACHED_VIEWS = 4
+PROGRESS_DELAY = 0.2
+ANIMATION_FPS = 30
+FRAME_BUDGET = 0.5
 
 
 class MazeDisplay:
@@ -19,6 +35,7 @@ class MazeDisplay:
 
     def __init__(self, m: Mlx, mlx: Any, maze: Maze, config: Config) -> None:
         self.config = config
+        self.stats = Stats(config.stats_file is not None)
         self.ratio = 5/10
         self.m = m
         self.mlx = mlx
@@ -26,8 +43,11 @@ class MazeDisplay:
         self._compute_geometry()
         self.win = self.m.mlx_new_window(self.mlx, self.width, self.win_height,
                                          "A Maze Ing - relaforg & nahecre")
+        self.cache = ChunkCache(0)
         self._unpack_maze(maze)
         self.img: Any
+        self.img_width = 0
+        self.img_height = 0
         self._compute_img()
         self.show_path = True
         self.colors = [0x1ABC9CFF,
@@ -52,12 +72,22 @@ class MazeDisplay:
         self.tmp_config: Config | None = None
         self.drag_start: Tuple[int, int] | None = None
         self.offset: Tuple[int, int] = (0, 0)
-
-    def _unpack_maze(self, maze: Maze) -> None:
+        self.job: RegenJob | None = None
+        self.prefetcher = Prefetcher(config.prefetch, config.prefetch_cells)
+        self.next_configs: dict[str, Callable[[], Config]] = {
+            "r": lambda: self.config,
+            "t": self.gen_random_config,
+        }
+        self.last_refresh = 0.0
+        self.animation: Animation | None = None
+
+    def _unpack_maze(self, maze: Maze, keys: list[bytes] | None = None) \
+            -> None:
         """Unpack all maze attributes
 
         Args:
         maze: The maze to be unpacked
+        keys: The tile keys of the maze, computed if not given
         """
         self.maze = maze.maze
         self.path = maze.path
@@ -66,6 +96,10 @@ class MazeDisplay:
         self.cols = maze.nbr_cols
         self.rows = maze.nbr_rows
         self.seed = maze.seed
+        self.keys = keys or cell_keys(self.maze, self.cols, self.rows,
+                                      self.entry, self.exit)
+        self.cache.clear()
+        self.levels: list[Level] = []
 
     def _compute_geometry(self) -> None:
         """Compute window size
@@ -75,20 +109,43 @@ class MazeDisplay:
         self.win_height = ceil(h * self.ratio)
         self.height = self.win_height - 50
 
+    @timed("compute_img")
     def _compute_img(self) -> None:
-        """Compute img size and attributes
+        """Compute the cell size and the img attributes
+        When the maze has more cells than the window has pixels, the first
+        zoom steps show levels of detail, down to the wall raster with two
+        pixels per cell, then cells of 4, 8, 16... pixels
+        The img only covers the window, it is recreated when the window
+        size changes
         """
+        fit = min(self.width // self.cols, self.height // self.rows) - 1
+        self.level: int | None = None
+        if (fit > 0):
+            self.cell_size = fit * self.zoom
+        else:
+            level = top_level(self.cols, self.rows,
+                              self.width, self.height) - self.zoom + 1
+            if (level >= 0):
+                self.level = level
+                self.cell_size = 1
+            else:
+                self.cell_size = 2 ** (1 - level)
+        self.cache.limit = CACHED_VIEWS * self.width * self.height
         if hasattr(self, "img") and self.img is not None:
+            if ((self.img_width, self.img_height)
+                    == (self.width, self.height)):
+                return
             self.m.mlx_destroy_image(self.mlx, self.img)
             self.img = None
-        self.cell_size = (min(self.width // self.cols,
-                              self.height // self.rows) - 1) * self.zoom
-        self.img_width = self.cols * self.cell_size + 1
-        self.img_height = self.rows * self.cell_size + 1
+        self.img_width = self.width
+        self.img_height = self.height
         self.img = self.m.mlx_new_image(
             self.mlx, self.img_width, self.img_height)
         self.addr, bpp, self.line_len, _ = self.m.mlx_get_data_addr(self.img)
         self.bpp = bpp // 8
+        self.base = bytearray(self.img_width * self.img_height)
+        self.layer = bytearray(self.base)
+        self.spans: list[Tuple[int, int]] = []
 
     def run(self) -> None:
         """Setup the window
@@ -98,20 +155,87 @@ class MazeDisplay:
         self.m.mlx_hook(self.win, 5, 1 << 3, self.on_mouse_release, None)
         self.m.mlx_hook(self.win, 33, 0,
                         lambda _: self.m.mlx_loop_exit(self.mlx), None)
+        self.m.mlx_loop_hook(self.mlx, self.on_loop, None)
         self.draw()
         self.refresh()
+        for key, make_config in self.next_configs.items():
+            self.prefetcher.fill(key, make_config)
+
+    def origin(self) -> Tuple[int, int]:
+        """Get the position of the maze in the window
 
+        Returns:
+        The coordinates of the maze top left corner, centered then moved
+        by the offset
+        """
+        if (self.level is not None):
+            _, width, height = self.lod()[self.level]
+        else:
+            width = self.cols * self.cell_size
+            height = self.rows * self.cell_size
+        return ((self.width - width) // 2 + self.offset[0],
+                (self.height - height) // 2 + self.offset[1])
+
+    def lod(self) -> list[Level]:
+        """Get the levels of detail of the maze, built on first use
+
+        Returns:
+        The levels, from the wall raster to the one fitting the window
+        """
+        depth = top_level(self.cols, self.rows, self.width, self.height)
+        if (len(self.levels) <= depth):
+            self.levels = pyramid(self.maze, self.cols, self.rows,
+                                  self.path, self.entry, self.exit, depth)
+        return self.levels
+
+    @timed("refresh")
     def refresh(self) -> None:
         """Refresh the window to display modification
+        The stats are shown over the maze while they are enabled
         """
-        x: int = (self.width - self.cols *
-                  self.cell_size) // 2 + self.offset[0]
-        y: int = (self.height - self.rows *
-                  self.cell_size) // 2 + self.offset[1]
         self.m.mlx_clear_window(self.mlx, self.win)
-        self.m.mlx_put_image_to_window(self.mlx, self.win, self.img, x, y)
+        self.m.mlx_put_image_to_window(self.mlx, self.win, self.img, 0, 0)
         self.m.mlx_string_put(self.mlx, self.win, 15, 10, 0xFFFFFFFF,
                               f"A Maze Ing - seed = {self.seed}")
+        if (self.animation is not None):
+            self.m.mlx_string_put(self.mlx, self.win, 15, self.height + 15,
+                                  0xFFFFFFFF, "Animating a new maze")
+        if (self.job is not None):
+            dots = "." * (int(self.job.elapsed() * 4) % 4)
+            self.m.mlx_string_put(self.mlx, self.win, 15, self.height + 15,
+                                  0xFFFFFFFF, f"Generating a new maze "
+                                  f"{self.job.elapsed():.1f}s {dots}")
+        if (self.stats.enabled):
+            for i, line in enumerate(self.stats.lines()):
+                self.m.mlx_string_put(self.mlx, self.win, self.width - 340,
+                                      10 + i * 15, 0xFFFF00FF, line)
+        self.last_refresh = monotonic()
+
+    def on_loop(self, _: Any) -> None:
+        """Loop hook, polling the maze being generated and the prefetched
+        ones
+        """
+        self.prefetcher.poll()
+        if (self.animation is not None):
+            self.animate()
+        if (self.job is None):
+            return
+        try:
+            maze = self.job.poll()
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            self.job = None
+            self.refresh()
+            return
+        if (maze is None):
+            if (monotonic() - self.last_refresh > PROGRESS_DELAY):
+                self.refresh()
+            return
+        job, self.job = self.job, None
+        for name, spent in job.timings.items():
+            self.stats.add_time(name, spent)
+        self.export_maze(maze, job.config)
+        self.show_maze(maze, job.keys)
 
     def on_mouse_release(self, button: int, x: int, y: int, _: Any) -> None:
         """Mouse click release handler
@@ -123,6 +247,7 @@ class MazeDisplay:
         if (self.drag_start and button == 1):
             self.offset = (self.offset[0] + x - self.drag_start[0],
                            self.offset[1] + y - self.drag_start[1])
+            self.draw()
             self.refresh()
             self.drag_start = None
 
@@ -160,17 +285,21 @@ class MazeDisplay:
         elif (keycode == 112):  # 'p'
             self.toggle_path()
         elif (keycode == 114):  # 'r'
-            self.regen_maze(self.config)
+            self.next_maze("r")
         elif (keycode == 119):  # 'w'
             self.change_wall_color()
         elif (keycode == 108):  # 'l'
             self.change_logo_color()
         elif (keycode == 116):  # 't'
-            self.regen_maze(self.gen_random_config())
+            self.next_maze("t")
         elif (keycode == 120):  # 'x'
             self.export_config()
         elif (keycode == 111):  # 'o'
             self.reset_maze()
+        elif (keycode == 103):  # 'g'
+            self.start_animation()
+        elif (keycode == 105):  # 'i'
+            self.toggle_stats()
         elif (keycode == 61):  # '='
             self.ratio += 1/10
             self.recreate_win()
@@ -202,28 +331,167 @@ class MazeDisplay:
         """Change the color of the maze's walls
         """
         self.wall_color = choice(self.colors)
-        self.draw()
+        self.paint()
         self.refresh()
 
     def change_logo_color(self) -> None:
         """Change the filled cells color
         """
         self.logo_color = choice(self.colors)
-        self.draw()
+        self.paint()
         self.refresh()
 
     def regen_maze(self, config: Config) -> None:
-        """Generate a new maze
+        """Start generating a new maze in the background, superseding the
+        one being generated if any
+        The maze is shown by the loop hook once it is ready
 
         Args:
         config: The config with which the new maze will be based of
         """
+        if (self.job is not None):
+            self.job.cancel()
+        self.animation = None
+        self.job = RegenJob(config)
+        self.refresh()
+
+    def next_maze(self, key: str) -> None:
+        """Show the next maze of the 'r' or 't' key, taking the prefetched
+        one if any, then prefetch the following one
+
+        Args:
+        key: "r" for a maze of the same config, "t" for a random one
+        """
+        job = self.prefetcher.take(key)
+        if (job is None):
+            self.regen_maze(self.next_configs[key]())
+        else:
+            if (self.job is not None):
+                self.job.cancel()
+            self.animation = None
+            self.job = job
+            self.on_loop(None)
+        self.prefetcher.fill(key, self.next_configs[key])
+
+    def start_animation(self) -> None:
+        """Generate then solve a maze of the current config in steps,
+        superseding the one being generated if any
+        The steps are run by the loop hook, which paints the changed cells
+        """
+        if (self.job is not None):
+            self.job.cancel()
+            self.job = None
+        self.animation = Animation(self.config)
+        self.last_frame = 0.0
+        self.step_budget = FRAME_BUDGET / ANIMATION_FPS
+
+    @timed("animate")
+    def animate(self) -> None:
+        """Run the animation steps fitting in a frame and paint the cells
+        they changed, at most ANIMATION_FPS times a second
+        The time given to the steps shrinks when painting them made the
+        frame too long, and grows back up to its share of the frame
+        Zoomed out levels of detail are only drawn once the maze is done
+        """
+        assert self.animation is not None
+        now = monotonic()
+        if (now - self.last_frame < 1 / ANIMATION_FPS):
+            return
+        self.last_frame = now
+        anim = self.animation
+        gen = anim.gen
+        try:
+            dug, explored, stamped = anim.advance(self.step_budget)
+        except Exception as e:
+            print(f"Error: {e}")
+            self.animation = None
+            self.refresh()
+            return
+        if (anim.maze is not None):
+            self.animation = None
+            self.export_maze(anim.maze, anim.config)
+            self.show_maze(anim.maze)
+            return
+        if (stamped):
+            self.show_maze(gen.maze_obj(gen.grid_repr(), ""))
+            return
+        self.stats.count("cells_dug", len(dug))
+        self.stats.count("cells_explored", len(explored))
+        self.paint_steps(dug, explored)
+        self.refresh()
+        frame = max(monotonic() - now, 1e-6)
+        self.step_budget = min(FRAME_BUDGET / ANIMATION_FPS,
+                               self.step_budget * 0.9 / ANIMATION_FPS
+                               / frame)
+
+    def paint_steps(self, dug: list[int], explored: list[int]) -> None:
+        """Update the tile keys around the dug cells and paint them, with
+        the cells explored by the solver filled over them
+        Both go on the base layer, so restoring the layer from it keeps
+        the solver trail
+
+        Args:
+        dug: The cells changed by the generator
+        explored: The cells explored by the solver
+        """
+        assert self.animation is not None
+        self.cache.clear()
+        self.levels = []
+        touched = update_keys(self.keys, self.animation.gen.lst_repr,
+                              self.cols, dug, self.entry, self.exit)
+        if (self.level is not None):
+            return
+        origin = self.origin()
+        spans = blit_cells(self.base, self.img_width, self.img_height,
+                           origin, self.keys, touched, self.cell_size)
+        spans += self.fill_explored(explored)
+        spans = merge_spans(spans, self.img_width)
+        for start, end in spans:
+            self.layer[start:end] = self.base[start:end]
+        self.stats.count("pixels_painted",
+                         sum(end - start for start, end in spans))
+        expand_spans(self.layer, self.img_width, spans, self.tables(),
+                     self.addr, self.line_len)
+
+    def fill_explored(self, explored: list[int]) -> list[Tuple[int, int]]:
+        """Fill the cells explored by the solver on the base layer
+
+        Args:
+        explored: The cell indexes
+
+        Returns:
+        The (start, end) runs drawn, as offsets in the layer
+        """
+        return fill_cells(self.base, self.img_width, self.img_height,
+                          self.origin(), (self.cols * self.cell_size + 1,
+                                          self.rows * self.cell_size + 1),
+                          [(i % self.cols, i // self.cols)
+                           for i in explored], self.cell_size, FLOOR)
+
+    @timed("export")
+    def export_maze(self, maze: Maze, config: Config) -> None:
+        """Write a new maze in the output file of its config, which becomes
+        the exported config
+
+        Args:
+        maze: The new maze
+        config: The config it was generated from
+        """
+        try:
+            maze.export_file(config.output_file)
+        except OSError as e:
+            print(f"Error: {e}")
         self.tmp_config = config
-        gen = MazeGen(config)
-        gen.dfs()
-        maze = gen.export_maze_obj()
-        gen.export_maze_file()
-        self._unpack_maze(maze)
+
+    @timed("show_maze")
+    def show_maze(self, maze: Maze, keys: list[bytes] | None = None) -> None:
+        """Replace the displayed maze
+
+        Args:
+        maze: The new maze
+        keys: The tile keys of the maze, computed if not given
+        """
+        self._unpack_maze(maze, keys)
         self._compute_geometry()
         self._compute_img()
         self.m.mlx_clear_window(self.mlx, self.win)
@@ -236,7 +504,6 @@ class MazeDisplay:
         Returns:
         The new random Config
         """
-        self.m.mlx_clear_window(self.mlx, self.win)
         width = randint(3, 250)
         height = randint(3, 250)
         entry = (randint(0, width - 1), randint(0, height - 1))
@@ -273,209 +540,100 @@ class MazeDisplay:
                     file.write(f"SEED={self.seed}\n")
                 if (conf.shape):
                     file.write(f"SHAPE={conf.shape}\n")
+                file.write(f"ALGORITHM={conf.algorithm}\n")
+                file.write(f"PREFETCH={conf.prefetch}\n")
+                file.write(f"PREFETCH_CELLS={conf.prefetch_cells}\n")
+                if (conf.stats_file):
+                    file.write(f"STATS_FILE={conf.stats_file}\n")
+                if (conf.cache_dir):
+                    file.write(f"CACHE_DIR={conf.cache_dir}\n")
+                    file.write(f"CACHE_SIZE={conf.cache_size}\n")
             print("Success: Configuration file successfully exported")
         except Exception:
             print("Error: Configuration file failed to export")
 
-    def fill_img(self, color: int = 0x000000FF) -> None:
-        """Fill an mlx image with color
-
-        Args:
-        color: The color with which the img will be filled
+    def toggle_stats(self) -> None:
+        """Toggle on and off the stats recording and overlay
         """
-        px = bytes((
-            (color >> 8) & 0xFF,
-            (color >> 16) & 0xFF,
-            (color >> 24) & 0xFF,
-            color & 0xFF,
-        ))
-        self.addr[:] = px * (self.img_width * self.img_height)
+        self.stats.enabled = not self.stats.enabled
+        self.refresh()
 
+    @timed("toggle_path")
     def toggle_path(self) -> None:
-        """Toggle on and off the path
+        """Toggle on and off the path, repainting only the path pixels
         """
-        if (self.show_path):
-            self.fill_path(0x000000FF)
-        else:
-            self.fill_path()
         self.show_path = not self.show_path
+        if (self.level is not None):
+            self.draw()
+            self.refresh()
+            return
+        self.put_path()
+        self.stats.count("pixels_painted",
+                         sum(end - start for start, end in self.spans))
+        expand_spans(self.layer, self.img_width, self.spans, self.tables(),
+                     self.addr, self.line_len)
         self.refresh()
 
+    @timed("draw")
     def draw(self) -> None:
-        """Draw the maze on the image
-        """
-        self.fill_img()
-        x, y = 0, 0
-        for line in self.maze.split("\n"):
-            for c in line:
-                if (c != ' '):
-                    self.put_cell(c, x * self.cell_size, y * self.cell_size)
-                x += 1
-            x = 0
-            y += 1
-
-            self.fill_cell(self.entry[0] * self.cell_size, self.entry[1]
-                           * self.cell_size, 0x00FF00FF)
-            self.fill_cell(self.exit[0] * self.cell_size, self.exit[1]
-                           * self.cell_size, 0xFF0000FF)
-        if (self.show_path):
-            self.fill_path()
-
-    def _connect_south(self, x: int, y: int, color: int) -> None:
-        """Connect path
+        """Draw the visible part of the maze on the base layer, from cached
+        chunks, lay the path over it then paint the image
+        Zoomed out levels of detail are drawn straight on the layer, with
+        the path
         """
-        if (self.cell_size == 2):
-            self.put_pixel(x * self.cell_size + 1,
-                           y * self.cell_size + 2, color)
-        elif (self.cell_size == 3):
-            self.put_line(x * self.cell_size + 1, y *
-                          self.cell_size + self.cell_size, 2, color)
-        else:
-            for i in range(3):
-                self.put_line(x * self.cell_size + 2, y *
-                              self.cell_size + self.cell_size - 1 + i,
-                              self.cell_size - 3, color)
-
-    def _connect_north(self, x: int, y: int, color: int) -> None:
-        """Connect path
-        """
-        if (self.cell_size == 2):
-            self.put_pixel(x * self.cell_size + 1,
-                           y * self.cell_size, color)
-        elif (self.cell_size == 3):
-            self.put_line(x * self.cell_size + 1, y *
-                          self.cell_size, 2, color)
-        else:
-            for i in range(3):
-                self.put_line(x * self.cell_size + 2, y *
-                              self.cell_size - 1 + i,
-                              self.cell_size - 3, color)
-
-    def _connect_west(self, x: int, y: int, color: int) -> None:
-        """Connect path
-        """
-        if (self.cell_size == 2):
-            self.put_pixel(x * self.cell_size,
-                           y * self.cell_size + 1, color)
-        elif (self.cell_size == 3):
-            self.put_col(x * self.cell_size, y *
-                         self.cell_size + 1, 2, color)
-        else:
-            for i in range(3):
-                self.put_col(x * self.cell_size - 1 + i, y *
-                             self.cell_size + 2, self.cell_size - 3,
-                             color)
-
-    def _connect_east(self, x: int, y: int, color: int) -> None:
-        """Connect path
-        """
-        if (self.cell_size == 2):
-            self.put_pixel(x * self.cell_size + 2,
-                           y * self.cell_size + 1, color)
-        elif (self.cell_size == 3):
-            self.put_col(x * self.cell_size + self.cell_size, y *
-                         self.cell_size + 1, 2, color)
-        else:
-            for i in range(3):
-                self.put_col(x * self.cell_size + self.cell_size - 1
-                             + i, y * self.cell_size + 2,
-                             self.cell_size - 3, color)
-
-    def fill_path(self, color: int = 0xC0C0C0FF) -> None:
-        """Draw the path
-        """
-        x, y = self.entry[0], self.entry[1]
-        for j in range(len(self.path)):
-            if (self.path[j] == "S"):
-                self._connect_south(x, y, color)
-                y += 1
-            elif (self.path[j] == "N"):
-                self._connect_north(x, y, color)
-                y -= 1
-            elif (self.path[j] == "W"):
-                self._connect_west(x, y, color)
-                x -= 1
-            elif (self.path[j] == "E"):
-                self._connect_east(x, y, color)
-                x += 1
-            if (j != len(self.path) - 1):
-                self.fill_cell(x * self.cell_size, y * self.cell_size, color)
-
-    def put_cell(self, s: str, cell_x: int, cell_y: int) -> None:
-        """Draw cell wall on image
-
-        Args:
-        s: Hexadecimal int
-        cell_x, cell_y: Cell coordinates
-        """
-        c = int(s, 16)
-        if (c & 1):
-            self.put_line(cell_x, cell_y, self.cell_size, self.wall_color)
-        if ((c >> 1) & 1):
-            self.put_col(cell_x + self.cell_size, cell_y,
-                         self.cell_size + 1, self.wall_color)
-        if ((c >> 2) & 1):
-            self.put_line(cell_x, cell_y + self.cell_size,
-                          self.cell_size + 1, self.wall_color)
-        if ((c >> 3) & 1):
-            self.put_col(cell_x, cell_y, self.cell_size, self.wall_color)
-        if (c == 0xF):
-            self.fill_cell(cell_x, cell_y, self.logo_color)
-
-    def put_line(self, x: int, y: int, size: int,
-                 color: int = 0xFFFFFFFF) -> None:
-        """Draw a line on the image
-
-        Args:
-        x, y: Start coordinates
-        size: Size of the line in pixel
-        color: The color of the line
+        if (self.level is not None):
+            render_level(self.layer, self.img_width, self.img_height,
+                         self.origin(), self.lod()[self.level],
+                         level_table(self.show_path))
+            self.spans = []
+            self.paint()
+            return
+        if (self.stats.enabled):
+            self.count_cells()
+        render_view(self.base, self.img_width, self.img_height,
+                    self.origin(), self.keys, self.cell_size, self.cache)
+        if (self.animation is not None):
+            self.fill_explored(self.animation.explored)
+        self.layer[:] = self.base
+        self.spans = path_spans(self.path, self.entry, self.cell_size,
+                                self.img_width, self.img_height,
+                                self.origin())
+        self.put_path()
+        self.paint()
+
+    def count_cells(self) -> None:
+        """Count the cells in sight
         """
-        for i in range(size):
-            self.put_pixel(x + i, y, color)
-
-    def put_col(self, x: int, y: int, size: int,
-                color: int = 0xFFFFFFFF) -> None:
-        """Draw a column on the image
-
-        Args:
-        x, y: Start coordinates
-        size: Size of the column in pixel
-        color: The color of the column
+        x, y = self.origin()
+        cs = self.cell_size
+        cols = min(self.cols, (self.width - x) // cs + 1) - max(0, -x // cs)
+        rows = min(self.rows, (self.height - y) // cs + 1) - max(0, -y // cs)
+        self.stats.count("cells_drawn", max(0, cols) * max(0, rows))
+
+    @timed("put_path")
+    def put_path(self) -> None:
+        """Write the path spans on the layer, or restore them from the base
+        layer when the path is hidden
         """
-        for i in range(size):
-            self.put_pixel(x, y + i, color)
-
-    def fill_cell(self, cell_x: int, cell_y: int,
-                  color: int = 0xFFFFFFFF) -> None:
-        """Fill a maze cell with a color
-
-        Args:
-        cell_x, cell_y: Cell coordinates
-        color: The color that the cell wil be filed with
-        """
-        if (self.cell_size == 2):
-            self.put_pixel(cell_x + 1, cell_y + 1, color)
-        elif (self.cell_size == 3):
-            for i in range(2):
-                self.put_line(cell_x + 1, cell_y + 1 + i, 2, color)
+        if (self.show_path):
+            for start, end in self.spans:
+                self.layer[start:end] = bytes((PATH,)) * (end - start)
         else:
-            for i in range(self.cell_size - 3):
-                self.put_line(cell_x + 2, cell_y + i + 2,
-                              self.cell_size - 3, color)
+            for start, end in self.spans:
+                self.layer[start:end] = self.base[start:end]
 
-    def put_pixel(self, x: int, y: int, color: int = 0xFFFFFFFF) -> None:
-        """Put a pixel on the image
+    def tables(self) -> list[bytes]:
+        """Build the palette tables of the current colors
 
-        Args:
-        x, y: pixel coordinates
-        color: The pixel color
+        Returns:
+        One translation table per byte of a pixel
         """
-        if x < 0 or y < 0 or x >= self.img_width or y >= self.img_height:
-            return
-        offset = y * self.line_len + x * self.bpp
+        return palette_tables(palette(self.wall_color, self.logo_color))
 
-        self.addr[offset] = (color >> 8) & 0xFF
-        self.addr[offset + 1] = (color >> 16) & 0xFF
-        self.addr[offset + 2] = (color >> 24) & 0xFF
-        self.addr[offset + 3] = color & 0xFF
+    @timed("paint")
+    def paint(self) -> None:
+        """Paint the image from the palette layer with the current colors
+        """
+        self.stats.count("pixels_painted", self.img_width * self.img_height)
+        expand(self.layer, self.img_width, self.img_height, self.tables(),
+               self.addr, self.line_len)
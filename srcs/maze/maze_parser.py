@@ -1,6 +1,10 @@
 from ..parser import Parser
 from pydantic import ValidationError
+from io import TextIOWrapper
+from typing import Iterator
 from ..mazegen.maze_gen import Maze
+from ..mazegen.maze_bin import BinaryMaze, is_binary
+from ..mazegen.maze_file import open_maze_file
 
 
 class MazeParser(Parser):
@@ -10,8 +14,15 @@ class MazeParser(Parser):
     file_path: The path of the config file
     """
 
+    def iter_lines(self) -> Iterator[str]:
+        """Yield file line one by one, the file may be compressed"""
+        with TextIOWrapper(open_maze_file(self.file_path, "rb")) as file:
+            for line in file:
+                yield line.rstrip("\n")
+
     def extract(self) -> Maze | None:
-        """Extract the maze from the maze file
+        """Extract the maze from the maze file, in the text or the binary
+        format
 
         Returns:
         A Maze object filled
@@ -19,8 +30,16 @@ class MazeParser(Parser):
         Raises:
         A formatted error message
         """
+        if (is_binary(self.file_path)):
+            with BinaryMaze(self.file_path) as binary:
+                try:
+                    return binary.to_maze()
+                except ValidationError as e:
+                    print(self.format_validation_error(e))
+                    return None
         nbr_rows = 0
-        maze = ""
+        nbr_cols = 0
+        lines: list[str] = []
         is_maze = True
         count = 0
         exit = ""
@@ -33,7 +52,7 @@ class MazeParser(Parser):
             if (is_maze):
                 nbr_rows += 1
                 nbr_cols = len(line)
-                maze += line + "\n"
+                lines.append(line)
             else:
                 if (count == 0):
                     entry = line
@@ -44,7 +63,7 @@ class MazeParser(Parser):
                 count += 1
         try:
             return Maze.model_validate({
-                "maze": maze,
+                "maze": "\n".join(lines),
                 "nbr_cols": nbr_cols,
                 "nbr_rows": nbr_rows,
                 "entry": entry,
@@ -0,0 +1,174 @@
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from time import monotonic, perf_counter
+from typing import Callable
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_cache import MazeCache
+from srcs.mazegen.maze_gen import Maze, MazeGen
+from srcs.maze.renderer import cell_keys
+
+
+def run_job(config: Config, conn: Connection) -> None:
+    """Generate and solve a maze and compute its tile keys, then send them
+    back, the display writing the output file once the maze is shown
+    Seeded mazes are read from the cache of the config when they are in it
+
+    Args:
+    config: The maze config
+    conn: The pipe to the display, receiving (True, Maze, keys, timings)
+    or (False, error message, [], {}), the timings being the seconds
+    spent in every phase
+    """
+    try:
+        timings: dict[str, float] = {}
+        start = perf_counter()
+        cache = MazeCache.of(config)
+        maze = cache.get(config) if cache else None
+        if (maze is not None):
+            timings["cache"] = perf_counter() - start
+        else:
+            gen = MazeGen(config)
+            gen.generate()
+            timings["generate"] = perf_counter() - start
+            start = perf_counter()
+            path = gen.solution(True)
+            timings["solve"] = perf_counter() - start
+            maze = gen.maze_obj(gen.grid_repr(), path)
+            if (cache is not None):
+                start = perf_counter()
+                cache.put(config, maze)
+                timings["cache"] = perf_counter() - start
+        start = perf_counter()
+        keys = cell_keys(maze.maze, maze.nbr_cols, maze.nbr_rows,
+                         maze.entry, maze.exit)
+        timings["keys"] = perf_counter() - start
+        conn.send((True, maze, keys, timings))
+    except Exception as e:
+        conn.send((False, str(e), [], {}))
+    finally:
+        conn.close()
+
+
+class RegenJob:
+    """
+    The RegenJob obj generates a maze in a child process, so the display
+    keeps running meanwhile, and can be cancelled at any time
+
+    Args:
+    config: The maze config
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.start = monotonic()
+        self.maze: Maze | None = None
+        self.keys: list[bytes] = []
+        self.timings: dict[str, float] = {}
+        self.conn, child = Pipe(duplex=False)
+        self.process = Process(target=run_job, args=(config, child),
+                               daemon=True)
+        self.process.start()
+        child.close()
+
+    def elapsed(self) -> float:
+        """Get the time spent on the job
+
+        Returns:
+        The elapsed time in seconds
+        """
+        return monotonic() - self.start
+
+    def poll(self) -> Maze | None:
+        """Get the maze if the job is done, without blocking
+        Its tile keys are then in self.keys, and the time spent in every
+        phase in self.timings
+
+        Returns:
+        The maze, or None while it is being generated
+
+        Raises:
+        RuntimeError: The generation failed
+        """
+        if (self.maze is not None or not self.conn.poll()):
+            return self.maze
+        try:
+            ok, result, self.keys, self.timings = self.conn.recv()
+        except EOFError:
+            ok, result = False, "The generation process died"
+        self.process.join()
+        self.conn.close()
+        if (not ok):
+            raise RuntimeError(result)
+        self.maze = result
+        return self.maze
+
+    def cancel(self) -> None:
+        """Stop the job, killing the child process
+        """
+        if (self.process.is_alive()):
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class Prefetcher:
+    """
+    The Prefetcher obj keeps the next mazes of some keys generating in the
+    background, so they are ready when the key is pressed
+
+    Args:
+    depth: The number of mazes kept ahead for every key
+    max_cells: The size above which a maze is not generated ahead
+    """
+
+    def __init__(self, depth: int, max_cells: int) -> None:
+        self.depth = depth
+        self.max_cells = max_cells
+        self.slots: dict[str, deque[RegenJob]] = {}
+
+    def fill(self, key: str, make_config: Callable[[], Config]) -> None:
+        """Start generating mazes for a key until its slot is full
+
+        Args:
+        key: The slot name
+        make_config: Gives the config of the next maze
+        """
+        slot = self.slots.setdefault(key, deque())
+        while (len(slot) < self.depth):
+            config = make_config()
+            if (config.width * config.height > self.max_cells):
+                return
+            slot.append(RegenJob(config))
+
+    def take(self, key: str) -> RegenJob | None:
+        """Take the oldest maze of a key, ready or still being generated
+
+        Args:
+        key: The slot name
+
+        Returns:
+        The job, or None if the slot is empty
+        """
+        slot = self.slots.get(key)
+        return slot.popleft() if slot else None
+
+    def poll(self) -> None:
+        """Collect the mazes that are done, so their child process ends,
+        and drop the failed ones
+        """
+        for slot in self.slots.values():
+            for job in list(slot):
+                try:
+                    job.poll()
+                except RuntimeError as e:
+                    print(f"Error: {e}")
+                    slot.remove(job)
+
+    def cancel(self) -> None:
+        """Stop every job
+        """
+        for slot in self.slots.values():
+            for job in slot:
+                job.cancel()
+            slot.clear()
@@ -0,0 +1,602 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Sequence, Tuple
+
+HEX_VALUES: bytes = bytes.maketrans(b"0123456789ABCDEF ",
+                                    bytes(range(16)) + b"\x00")
+
+BG = 0
+WALL = 1
+LOGO = 2
+PATH = 3
+ENTRY = 4
+EXIT = 5
+FLOOR = 6
+
+CORNER = 1
+TOP = 2
+LEFT = 4
+FILL_LOGO = 8
+FILL_ENTRY = 16
+FILL_EXIT = 24
+
+CHUNK_PIXELS = 256
+
+OWN_KEYS: bytes = bytes((CORNER if v & 9 else 0) | (TOP if v & 1 else 0)
+                        | (LEFT if v & 8 else 0)
+                        | (FILL_LOGO if v == 15 else 0) for v in range(256))
+LEFT_KEYS: bytes = bytes(CORNER | LEFT if v & 2 else 0 for v in range(256))
+UP_KEYS: bytes = bytes(CORNER | TOP if v & 4 else 0 for v in range(256))
+DIAG_KEYS: bytes = bytes(CORNER if v & 6 else 0 for v in range(256))
+
+
+def pixel(color: int) -> bytes:
+    """Convert a color to the bytes of one image pixel
+
+    Args:
+    color: The color, as 0xRRGGBBAA
+
+    Returns:
+    The pixel, in the byte order of the mlx image
+    """
+    return bytes((
+        (color >> 8) & 0xFF,
+        (color >> 16) & 0xFF,
+        (color >> 24) & 0xFF,
+        color & 0xFF,
+    ))
+
+
+def fill_box(cell_size: int) -> Tuple[int, int]:
+    """Get the part of a cell painted when the cell is filled
+
+    Args:
+    cell_size: The cell size in pixel
+
+    Returns:
+    The offset of the filled square in the cell and its side
+    """
+    if (cell_size == 2):
+        return (1, 1)
+    if (cell_size == 3):
+        return (1, 2)
+    return (2, cell_size - 3)
+
+
+@lru_cache(maxsize=8)
+def tile_set(cell_size: int, bg: bytes, wall: bytes,
+             fills: Tuple[bytes, bytes, bytes]) -> list[list[bytes]]:
+    """Pre-render every cell tile
+    A tile owns the top and left edges of its cell, the bottom and right
+    ones belong to the next cells. It is keyed by which of its corner, top
+    edge and left edge are walls, plus the color the cell is filled with
+
+    Args:
+    cell_size: The tile side in pixel
+    bg, wall: The background and wall pixels
+    fills: The logo, entry and exit pixels
+
+    Returns:
+    The rows of every tile, indexed by key
+    """
+    start, side = fill_box(cell_size)
+    tiles: list[list[bytes]] = []
+    for key in range(32):
+        fill: bytes | None = fills[(key >> 3) - 1] if key >> 3 else None
+        top = (wall if key & CORNER else bg) \
+            + (wall if key & TOP else bg) * (cell_size - 1)
+        side_px = wall if key & LEFT else bg
+        plain = side_px + bg * (cell_size - 1)
+        filled = plain
+        if (fill is not None and side > 0):
+            filled = side_px + bg * (start - 1) + fill * side \
+                + bg * (cell_size - start - side)
+        rows = [top] + [filled if start <= y < start + side else plain
+                        for y in range(1, cell_size)]
+        tiles.append(rows)
+    return tiles
+
+
+def palette(wall_color: int, logo_color: int) -> list[int]:
+    """Get the color of every palette index
+
+    Args:
+    wall_color, logo_color: The wall and logo colors, as 0xRRGGBBAA
+
+    Returns:
+    The colors, the floor being the wall color dimmed
+    """
+    return [0x000000FF, wall_color, logo_color, 0xC0C0C0FF,
+            0x00FF00FF, 0xFF0000FF,
+            (wall_color >> 1) & 0x7F7F7F00 | wall_color & 0xFF]
+
+
+def cell_keys(maze: str, cols: int, rows: int,
+              entry: Tuple[int, int], exit: Tuple[int, int]) -> list[bytes]:
+    """Compute the tile key of every cell
+
+    Args:
+    maze: The maze, as hexadecimal lines
+    cols, rows: The maze size
+    entry, exit: The entry and exit cells
+
+    Returns:
+    The keys of every row, with one more column and row for the right
+    and bottom borders
+    """
+    return list(key_rows(maze.encode().split(b"\n"), cols, rows,
+                         entry, exit))
+
+
+def key_rows(lines: Iterable[bytes], cols: int, rows: int,
+             entry: Tuple[int, int],
+             exit: Tuple[int, int]) -> Iterator[bytes]:
+    """Compute the tile keys of a maze one row at a time
+    One more column and row are added for the right and bottom borders
+    The keys of a row are the OR of what the cell, its left, upper and
+    upper left neighbors give, computed on whole rows as big ints
+
+    Args:
+    lines: The hexadecimal lines of the maze
+    cols, rows: The maze size
+    entry, exit: The entry and exit cells
+
+    Returns:
+    An iterator over the keys of every row
+    """
+    lines = iter(lines)
+    prev = bytes(cols + 1)
+    for y in range(rows + 1):
+        raw = next(lines, b"")[:cols] if y < rows else b""
+        cur = raw.ljust(cols).translate(HEX_VALUES) + b"\x00"
+        key = (int.from_bytes(cur.translate(OWN_KEYS), "big")
+               | int.from_bytes(cur.translate(LEFT_KEYS), "big") >> 8
+               | int.from_bytes(prev.translate(UP_KEYS), "big")
+               | int.from_bytes(prev.translate(DIAG_KEYS), "big") >> 8)
+        row = bytearray(key.to_bytes(cols + 1, "big"))
+        for cell, fill in ((entry, FILL_ENTRY), (exit, FILL_EXIT)):
+            if (cell[1] == y and 0 <= cell[0] < cols):
+                row[cell[0]] = (row[cell[0]] & 7) | fill
+        yield bytes(row)
+        prev = cur
+
+
+def update_keys(keys: list[bytes], grid: Sequence[int], cols: int,
+                cells: Iterable[int], entry: Tuple[int, int],
+                exit: Tuple[int, int]) -> set[Tuple[int, int]]:
+    """Recompute the tile keys around some changed cells
+    A cell gives its key to its own tile and to the right, lower and
+    lower right ones, which are the tiles recomputed
+
+    Args:
+    keys: The keys of every row, with the border column and row, updated
+    grid: The wall bits of every cell, negative outside of the shape
+    cols: The maze width
+    cells: The indexes of the changed cells
+    entry, exit: The entry and exit cells
+
+    Returns:
+    The (x, y) of the recomputed tiles
+    """
+    rows = len(keys) - 1
+
+    def value(x: int, y: int) -> int:
+        if (x < 0 or y < 0 or x >= cols or y >= rows):
+            return 0
+        return max(grid[y * cols + x], 0)
+
+    touched: set[Tuple[int, int]] = set()
+    for cell in cells:
+        y, x = divmod(cell, cols)
+        touched.update(((x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)))
+    lines: dict[int, bytearray] = {}
+    for x, y in touched:
+        key = (OWN_KEYS[value(x, y)] | LEFT_KEYS[value(x - 1, y)]
+               | UP_KEYS[value(x, y - 1)] | DIAG_KEYS[value(x - 1, y - 1)])
+        for pos, fill in ((entry, FILL_ENTRY), (exit, FILL_EXIT)):
+            if ((x, y) == pos):
+                key = (key & 7) | fill
+        if (y not in lines):
+            lines[y] = bytearray(keys[y])
+        lines[y][x] = key
+    for y, line in lines.items():
+        keys[y] = bytes(line)
+    return touched
+
+
+def blit_tiles(addr: Any, line_len: int, keys: Sequence[bytes],
+               tiles: list[list[bytes]], cell_size: int, bpp: int,
+               width: int, height: int) -> None:
+    """Copy the tiles of some cells in an image, one pixel row at a time
+    The tiles past width or height pixels are clipped, which is how the
+    extra column and row of keys only give the right and bottom borders
+
+    Args:
+    addr: The image buffer
+    line_len: The size of an image line in bytes
+    keys: The tile key of every cell
+    tiles: The rows of every tile
+    cell_size: The cell size in pixel
+    bpp: The size of a pixel in bytes
+    width, height: The size of the drawn area in pixel
+    """
+    full, rest = divmod(width, cell_size)
+    for y, row in enumerate(keys):
+        top = y * cell_size
+        if (top >= height):
+            return
+        sprites = [tiles[key] for key in row[:full]]
+        edge = tiles[row[full]] if rest else None
+        for r in range(min(cell_size, height - top)):
+            line = b"".join([sprite[r] for sprite in sprites])
+            if (edge is not None):
+                line += edge[r][:rest * bpp]
+            start = (top + r) * line_len
+            addr[start:start + len(line)] = line
+
+
+class ChunkCache:
+    """
+    The ChunkCache obj keeps the last rendered chunks of a maze, dropping
+    the least recently used ones once they take more than limit bytes
+
+    Args:
+    limit: The size of the cache in bytes
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.size = 0
+        self.chunks: OrderedDict[Tuple[int, int, int], bytearray] = \
+            OrderedDict()
+
+    def get(self, key: Tuple[int, int, int]) -> bytearray | None:
+        """Get a chunk, marking it as recently used
+
+        Args:
+        key: The cell size and position of the chunk
+
+        Returns:
+        The chunk or None if it is not cached
+        """
+        chunk = self.chunks.get(key)
+        if (chunk is not None):
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def put(self, key: Tuple[int, int, int], chunk: bytearray) -> None:
+        """Add a chunk, dropping the oldest ones if the cache is full
+
+        Args:
+        key: The cell size and position of the chunk
+        chunk: The rendered chunk
+        """
+        self.size += len(chunk)
+        self.chunks[key] = chunk
+        while (self.size > self.limit and len(self.chunks) > 1):
+            _, old = self.chunks.popitem(last=False)
+            self.size -= len(old)
+
+    def clear(self) -> None:
+        """Drop every chunk
+        """
+        self.chunks.clear()
+        self.size = 0
+
+
+def chunk_cells(cell_size: int) -> int:
+    """Get the side of a chunk in cells
+
+    Args:
+    cell_size: The cell size in pixel
+
+    Returns:
+    The number of cells, so that a chunk is about CHUNK_PIXELS wide
+    """
+    return max(1, CHUNK_PIXELS // cell_size)
+
+
+def render_view(view: bytearray, width: int, height: int,
+                origin: Tuple[int, int], keys: list[bytes],
+                cell_size: int, cache: ChunkCache) -> None:
+    """Draw the visible part of a maze on a palette layer
+    The maze is cut in square chunks of cells, rendered once and kept in
+    the cache, so only the chunks in sight are ever rasterized
+
+    Args:
+    view: The palette layer, width * height bytes, drawn over entirely
+    width, height: The view size in pixel
+    origin: The position of the maze top left corner in the view
+    keys: The tile key of every cell, with the border column and row
+    cell_size: The cell size in pixel
+    cache: The chunks already rendered
+    """
+    view[:] = bytes(len(view))
+    side = chunk_cells(cell_size)
+    span = side * cell_size
+    maze_w = (len(keys[0]) - 1) * cell_size + 1
+    maze_h = (len(keys) - 1) * cell_size + 1
+    x0, y0 = max(0, -origin[0]), max(0, -origin[1])
+    x1 = min(maze_w, width - origin[0])
+    y1 = min(maze_h, height - origin[1])
+    if (x0 >= x1 or y0 >= y1):
+        return
+    tiles = tile_set(cell_size, bytes((BG,)), bytes((WALL,)),
+                     (bytes((LOGO,)), bytes((ENTRY,)), bytes((EXIT,))))
+    for cy in range(y0 // span, (y1 - 1) // span + 1):
+        for cx in range(x0 // span, (x1 - 1) // span + 1):
+            chunk_w = min(span, maze_w - cx * span)
+            chunk_h = min(span, maze_h - cy * span)
+            chunk = cache.get((cell_size, cx, cy))
+            if (chunk is None):
+                chunk = bytearray(chunk_w * chunk_h)
+                blit_tiles(chunk, chunk_w,
+                           [row[cx * side:(cx + 1) * side + 1] for row
+                            in keys[cy * side:(cy + 1) * side + 1]],
+                           tiles, cell_size, 1, chunk_w, chunk_h)
+                cache.put((cell_size, cx, cy), chunk)
+            left = max(x0, cx * span)
+            right = min(x1, cx * span + chunk_w)
+            for y in range(max(y0, cy * span), min(y1, cy * span + chunk_h)):
+                src = (y - cy * span) * chunk_w - cx * span
+                dst = (y + origin[1]) * width + origin[0]
+                view[dst + left:dst + right] = chunk[src + left:src + right]
+
+
+def palette_tables(palette: Sequence[int]) -> list[bytes]:
+    """Build the tables turning palette indexes into image pixels
+
+    Args:
+    palette: The color of every index, as 0xRRGGBBAA
+
+    Returns:
+    One translation table per byte of a pixel
+    """
+    pixels = [pixel(color) for color in palette]
+    return [bytes(px[k] for px in pixels).ljust(256, b"\x00")
+            for k in range(len(pixels[0]))]
+
+
+def expand(layer: bytearray, width: int, height: int,
+           tables: list[bytes], addr: Any, line_len: int) -> None:
+    """Paint an image from a palette layer, one row at a time
+    Rows are mostly copies of the same few tile rows, so every distinct
+    row is expanded once and the next ones are plain copies
+
+    Args:
+    layer: The palette index of every pixel, width * height bytes
+    width, height: The image size in pixel
+    tables: The translation table of every pixel byte
+    addr: The image buffer
+    line_len: The size of an image line in bytes
+    """
+    bpp = len(tables)
+    row = width * bpp
+    done: dict[bytes, bytearray] = {}
+    for y in range(height):
+        src = bytes(layer[y * width:(y + 1) * width])
+        pixels = done.get(src)
+        if (pixels is None):
+            pixels = bytearray(row)
+            for k, table in enumerate(tables):
+                pixels[k::bpp] = src.translate(table)
+            done[src] = pixels
+        addr[y * line_len:y * line_len + row] = pixels
+
+
+def path_rects(cell_size: int) -> dict[str, Tuple[int, int, int, int]]:
+    """Get the rectangles drawn for the path, relative to a cell
+
+    Args:
+    cell_size: The cell size in pixel
+
+    Returns:
+    The (x, y, width, height) of the cell fill under the "F" key and of
+    the connection to the next cell under its direction
+    """
+    start, side = fill_box(cell_size)
+    if (cell_size <= 3):
+        return {"F": (start, start, side, side),
+                "N": (start, 0, side, 1),
+                "S": (start, cell_size, side, 1),
+                "W": (0, start, 1, side),
+                "E": (cell_size, start, 1, side)}
+    return {"F": (2, 2, side, side),
+            "N": (2, -1, side, 3),
+            "S": (2, cell_size - 1, side, 3),
+            "W": (-1, 2, 3, side),
+            "E": (cell_size - 1, 2, 3, side)}
+
+
+def path_spans(path: str, entry: Tuple[int, int], cell_size: int,
+               width: int, height: int,
+               origin: Tuple[int, int] = (0, 0)) -> list[Tuple[int, int]]:
+    """Compute the pixels covered by the path, as runs of a row
+
+    Args:
+    path: The path directions
+    entry: The cell the path starts from
+    cell_size: The cell size in pixel
+    width, height: The image size in pixel
+    origin: The position of the maze top left corner in the image
+
+    Returns:
+    The (start, end) of every run, as offsets in a width * height layer
+    """
+    rects = path_rects(cell_size)
+    moves = {"N": (0, -1), "S": (0, 1), "W": (-1, 0), "E": (1, 0)}
+    runs: dict[int, list[Tuple[int, int]]] = {}
+
+    def add(cell_x: int, cell_y: int, key: str) -> None:
+        rx, ry, rw, rh = rects[key]
+        rx += cell_x * cell_size + origin[0]
+        ry += cell_y * cell_size + origin[1]
+        x0, x1 = max(rx, 0), min(rx + rw, width)
+        if (x0 >= x1):
+            return
+        for y in range(max(ry, 0), min(ry + rh, height)):
+            runs.setdefault(y, []).append((x0, x1))
+
+    x, y = entry
+    for j, step in enumerate(path):
+        if (step not in moves):
+            continue
+        add(x, y, step)
+        x, y = x + moves[step][0], y + moves[step][1]
+        if (j != len(path) - 1):
+            add(x, y, "F")
+
+    spans: list[Tuple[int, int]] = []
+    for y in sorted(runs):
+        row = sorted(runs[y])
+        start, end = row[0]
+        for x0, x1 in row[1:]:
+            if (x0 > end):
+                spans.append((y * width + start, y * width + end))
+                start = x0
+            end = max(end, x1)
+        spans.append((y * width + start, y * width + end))
+    return spans
+
+
+def merge_spans(spans: list[Tuple[int, int]],
+                width: int) -> list[Tuple[int, int]]:
+    """Merge the overlapping and touching runs of a layer, a run never
+    going past the end of its row
+
+    Args:
+    spans: The (start, end) runs, as offsets in the layer
+    width: The layer width in pixel
+
+    Returns:
+    The sorted runs, none of them overlapping
+    """
+    merged: list[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if (merged and start <= merged[-1][1]
+                and start // width == merged[-1][0] // width):
+            if (end > merged[-1][1]):
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def expand_spans(layer: bytearray, width: int,
+                 spans: list[Tuple[int, int]], tables: list[bytes],
+                 addr: Any, line_len: int) -> None:
+    """Paint some runs of an image from its palette layer
+
+    Args:
+    layer: The palette index of every pixel
+    width: The image width in pixel
+    spans: The (start, end) runs to paint, as offsets in the layer
+    tables: The translation table of every pixel byte
+    addr: The image buffer
+    line_len: The size of an image line in bytes
+    """
+    bpp = len(tables)
+    for start, end in spans:
+        src = layer[start:end]
+        pixels = bytearray((end - start) * bpp)
+        for k, table in enumerate(tables):
+            pixels[k::bpp] = src.translate(table)
+        offset = (start // width) * line_len + (start % width) * bpp
+        addr[offset:offset + len(pixels)] = pixels
+
+
+def cell_spans(cells: Iterable[Tuple[int, int]],
+               rect: Tuple[int, int, int, int], cell_size: int,
+               bounds: Tuple[int, int], width: int, height: int,
+               origin: Tuple[int, int]) -> list[Tuple[int, int, int, int]]:
+    """Place the same rectangle in some cells of a view
+
+    Args:
+    cells: The (x, y) of the cells
+    rect: The (x, y, width, height) of the rectangle, relative to a cell
+    cell_size: The cell size in pixel
+    bounds: The size of the maze in pixel, past which nothing is drawn
+    width, height: The view size in pixel
+    origin: The position of the maze top left corner in the view
+
+    Returns:
+    The (x0, y0, x1, y1) of the visible part of every rectangle, in maze
+    pixels
+    """
+    rx, ry, rw, rh = rect
+    boxes: list[Tuple[int, int, int, int]] = []
+    for x, y in cells:
+        left, top = x * cell_size + rx, y * cell_size + ry
+        x0 = max(left, -origin[0], 0)
+        y0 = max(top, -origin[1], 0)
+        x1 = min(left + rw, width - origin[0], bounds[0])
+        y1 = min(top + rh, height - origin[1], bounds[1])
+        if (x0 < x1 and y0 < y1):
+            boxes.append((x0, y0, x1, y1))
+    return boxes
+
+
+def blit_cells(view: bytearray, width: int, height: int,
+               origin: Tuple[int, int], keys: list[bytes],
+               cells: Iterable[Tuple[int, int]],
+               cell_size: int) -> list[Tuple[int, int]]:
+    """Draw the tiles of some cells on a palette layer
+
+    Args:
+    view: The palette layer, width * height bytes
+    width, height: The view size in pixel
+    origin: The position of the maze top left corner in the view
+    keys: The tile key of every cell, with the border column and row
+    cells: The (x, y) of the tiles to draw
+    cell_size: The cell size in pixel
+
+    Returns:
+    The (start, end) runs drawn, as offsets in the layer
+    """
+    tiles = tile_set(cell_size, bytes((BG,)), bytes((WALL,)),
+                     (bytes((LOGO,)), bytes((ENTRY,)), bytes((EXIT,))))
+    bounds = ((len(keys[0]) - 1) * cell_size + 1,
+              (len(keys) - 1) * cell_size + 1)
+    spans: list[Tuple[int, int]] = []
+    for x0, y0, x1, y1 in cell_spans(cells, (0, 0, cell_size, cell_size),
+                                     cell_size, bounds, width, height,
+                                     origin):
+        cx, cy = x0 // cell_size, y0 // cell_size
+        tile = tiles[keys[cy][cx]]
+        sx = x0 - cx * cell_size
+        for y in range(y0, y1):
+            row = tile[y - cy * cell_size]
+            start = (y + origin[1]) * width + x0 + origin[0]
+            view[start:start + x1 - x0] = row[sx:sx + x1 - x0]
+            spans.append((start, start + x1 - x0))
+    return spans
+
+
+def fill_cells(view: bytearray, width: int, height: int,
+               origin: Tuple[int, int], bounds: Tuple[int, int],
+               cells: Iterable[Tuple[int, int]], cell_size: int,
+               index: int) -> list[Tuple[int, int]]:
+    """Fill the inside of some cells on a palette layer, the way the path
+    fills them
+
+    Args:
+    view: The palette layer, width * height bytes
+    width, height: The view size in pixel
+    origin: The position of the maze top left corner in the view
+    bounds: The size of the maze in pixel
+    cells: The (x, y) of the cells to fill
+    cell_size: The cell size in pixel
+    index: The palette index to fill them with
+
+    Returns:
+    The (start, end) runs drawn, as offsets in the layer
+    """
+    spans: list[Tuple[int, int]] = []
+    for x0, y0, x1, y1 in cell_spans(cells, path_rects(cell_size)["F"],
+                                     cell_size, bounds, width, height,
+                                     origin):
+        for y in range(y0, y1):
+            start = (y + origin[1]) * width + x0 + origin[0]
+            view[start:start + x1 - x0] = bytes((index,)) * (x1 - x0)
+            spans.append((start, start + x1 - x0))
+    return spans
@@ -0,0 +1,330 @@
+import struct
+import zlib
+from argparse import ArgumentParser
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Tuple
+from srcs.mazegen.maze_bin import BinaryMaze, is_binary
+from srcs.mazegen.maze_gen import Maze
+from srcs.maze.renderer import (BG, ENTRY, EXIT, LOGO, PATH, WALL, key_rows,
+                                palette, path_rects, tile_set)
+
+PATH_FILL = 1
+PATH_MOVES: dict[str, Tuple[int, int, int, int]] = {
+    "N": (0, -1, 2, 8), "E": (1, 0, 4, 16), "S": (0, 1, 8, 2),
+    "W": (-1, 0, 16, 4),
+}
+IDAT_SIZE = 1 << 16
+
+
+def maze_lines(maze: str) -> Iterator[bytes]:
+    """Split a maze in lines without copying it whole
+
+    Args:
+    maze: The maze, as hexadecimal lines
+
+    Returns:
+    An iterator over the encoded lines
+    """
+    start = 0
+    while (start < len(maze)):
+        end = maze.find("\n", start)
+        if (end < 0):
+            end = len(maze)
+        yield maze[start:end].encode()
+        start = end + 1
+
+
+def path_marks(path: str, entry: Tuple[int, int], cols: int,
+               rows: int) -> dict[int, dict[int, int]]:
+    """Mark what the path draws in the cells it goes through
+    A cell gets PATH_FILL when its inside is filled and the bit of every
+    side the path crosses, on both cells of the side
+
+    Args:
+    path: The path directions
+    entry: The cell the path starts from
+    cols, rows: The maze size
+
+    Returns:
+    The marks of the path cells, by row then column, so that memory
+    follows the path length and not the maze size
+    """
+    marks: dict[int, dict[int, int]] = {}
+    x, y = entry
+    for j, step in enumerate(path):
+        if (step not in PATH_MOVES):
+            continue
+        dx, dy, out, back = PATH_MOVES[step]
+        if (0 <= x < cols and 0 <= y < rows):
+            row = marks.setdefault(y, {})
+            row[x] = row.get(x, 0) | out
+        x, y = x + dx, y + dy
+        if (0 <= x < cols and 0 <= y < rows):
+            row = marks.setdefault(y, {})
+            row[x] = row.get(x, 0) | back
+            if (j != len(path) - 1):
+                row[x] |= PATH_FILL
+    return marks
+
+
+@lru_cache(maxsize=8)
+def path_masks(cell_size: int) -> list[list[bytes]]:
+    """Pre-render the path part of every cell tile
+    The path rectangles of a side stick out of their cell, the part in the
+    cell on the other side being drawn by the mark of that cell
+
+    Args:
+    cell_size: The tile side in pixel
+
+    Returns:
+    The rows of every mask, 0xFF on the path pixels, indexed by marks
+    """
+    rects = path_rects(cell_size)
+    parts = [("F", PATH_FILL)] + [(key, out) for key, (_, _, out, _)
+                                  in PATH_MOVES.items()]
+    masks: list[list[bytes]] = []
+    for marks in range(32):
+        tile = [bytearray(cell_size) for _ in range(cell_size)]
+        for key, bit in parts:
+            if (not marks & bit):
+                continue
+            rx, ry, rw, rh = rects[key]
+            x0, x1 = max(rx, 0), min(rx + rw, cell_size)
+            for y in range(max(ry, 0), min(ry + rh, cell_size)):
+                tile[y][x0:x1] = b"\xff" * (x1 - x0)
+        masks.append([bytes(row) for row in tile])
+    return masks
+
+
+def index_rows(maze: Maze, cell_size: int,
+               show_path: bool = True) -> Iterator[bytes]:
+    """Render a maze one palette index row at a time, with the tiles and
+    path of the display
+
+    Args:
+    maze: The maze
+    cell_size: The cell size in pixel
+    show_path: Whether the path is drawn
+
+    Returns:
+    An iterator over the rows, of maze.nbr_cols * cell_size + 1 pixels
+    """
+    return line_rows(maze_lines(maze.maze), maze.nbr_cols, maze.nbr_rows,
+                     maze.entry, maze.exit, maze.path, cell_size, show_path)
+
+
+def line_rows(lines: Iterable[bytes], cols: int, rows: int,
+              entry: Tuple[int, int], exit: Tuple[int, int], path: str,
+              cell_size: int, show_path: bool = True) -> Iterator[bytes]:
+    """Render the hexadecimal lines of a maze one palette index row at a
+    time, with the tiles and path of the display
+    Only the rows of one cell and the marks of the path are in memory at
+    once, so the lines can be streamed from a file
+
+    Args:
+    lines: The hexadecimal lines of the maze
+    cols, rows: The maze size
+    entry, exit: The entry and exit cells
+    path: The path directions
+    cell_size: The cell size in pixel
+    show_path: Whether the path is drawn
+
+    Returns:
+    An iterator over the rows, of cols * cell_size + 1 pixels
+    """
+    height = rows * cell_size + 1
+    tiles = tile_set(cell_size, bytes((BG,)), bytes((WALL,)),
+                     (bytes((LOGO,)), bytes((ENTRY,)), bytes((EXIT,))))
+    marks = path_marks(path, entry, cols, rows) if show_path else {}
+    masks = path_masks(cell_size)
+    fill = int.from_bytes(bytes((PATH,)) * (cols * cell_size + 1), "big")
+    for y, row in enumerate(key_rows(lines, cols, rows, entry, exit)):
+        sprites = [tiles[key] for key in row[:cols]]
+        edge = tiles[row[cols]]
+        tiles_path = None
+        if (y in marks):
+            line = bytearray(cols)
+            for x, mark in marks[y].items():
+                line[x] = mark
+            tiles_path = [masks[mark] for mark in line]
+        for r in range(min(cell_size, height - y * cell_size)):
+            pixels = b"".join([sprite[r] for sprite in sprites]) \
+                + edge[r][:1]
+            if (tiles_path is not None):
+                mask = int.from_bytes(b"".join([m[r] for m in tiles_path])
+                                      + b"\x00", "big")
+                pixels = (int.from_bytes(pixels, "big") & ~mask
+                          | mask & fill).to_bytes(len(pixels), "big")
+            yield pixels
+
+
+def write_chunk(file: BinaryIO, kind: bytes, data: bytes) -> None:
+    """Write a PNG chunk
+
+    Args:
+    file: The PNG file
+    kind: The chunk type
+    data: The chunk data
+    """
+    file.write(struct.pack(">I", len(data)) + kind + data)
+    file.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def write_png(file: BinaryIO, rows: Iterable[bytes], width: int,
+              height: int, colors: list[int], level: int = 6) -> None:
+    """Write a palette PNG, compressing the rows as they come
+
+    Args:
+    file: The output file
+    rows: The palette index rows
+    width, height: The image size in pixel
+    colors: The color of every palette index, as 0xRRGGBBAA
+    level: The zlib compression level
+    """
+    file.write(b"\x89PNG\r\n\x1a\n")
+    write_chunk(file, b"IHDR",
+                struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+    write_chunk(file, b"PLTE", b"".join(color.to_bytes(4, "big")[:3]
+                                        for color in colors))
+    compressor = zlib.compressobj(level)
+    data = bytearray()
+    for row in rows:
+        data += compressor.compress(b"\x00" + row)
+        if (len(data) >= IDAT_SIZE):
+            write_chunk(file, b"IDAT", bytes(data))
+            data.clear()
+    data += compressor.flush()
+    write_chunk(file, b"IDAT", bytes(data))
+    write_chunk(file, b"IEND", b"")
+
+
+def write_ppm(file: BinaryIO, rows: Iterable[bytes], width: int,
+              height: int, colors: list[int]) -> None:
+    """Write a binary PPM, turning the rows into RGB pixels as they come
+
+    Args:
+    file: The output file
+    rows: The palette index rows
+    width, height: The image size in pixel
+    colors: The color of every palette index, as 0xRRGGBBAA
+    """
+    tables = [bytes((color >> shift) & 0xFF for color in colors)
+              .ljust(256, b"\x00") for shift in (24, 16, 8)]
+    file.write(f"P6\n{width} {height}\n255\n".encode())
+    last, pixels = b"", bytearray(width * 3)
+    for row in rows:
+        if (row != last):
+            for k, table in enumerate(tables):
+                pixels[k::3] = row.translate(table)
+            last = row
+        file.write(pixels)
+
+
+def export_image(maze: Maze, file_path: str, cell_size: int = 4,
+                 show_path: bool = True, wall_color: int = 0xFFFFFFFF,
+                 logo_color: int = 0xFFFFFFFF) -> None:
+    """Render a maze in a PNG or PPM file, without any window
+
+    Args:
+    maze: The maze
+    file_path: The image path, its extension giving the format
+    cell_size: The cell size in pixel
+    show_path: Whether the path is drawn
+    wall_color, logo_color: The wall and logo colors, as 0xRRGGBBAA
+
+    Raises:
+    ValueError: The cell size or the file extension is not supported
+    """
+    write_image(file_path, index_rows(maze, cell_size, show_path),
+                maze.nbr_cols, maze.nbr_rows, cell_size,
+                palette(wall_color, logo_color))
+
+
+def export_binary_image(binary: BinaryMaze, file_path: str,
+                        cell_size: int = 4, show_path: bool = True,
+                        wall_color: int = 0xFFFFFFFF,
+                        logo_color: int = 0xFFFFFFFF) -> None:
+    """Render a binary maze file in a PNG or PPM file, its rows being read
+    from the memory map as they are drawn, without loading the maze
+
+    Args:
+    binary: The opened binary maze
+    file_path: The image path, its extension giving the format
+    cell_size: The cell size in pixel
+    show_path: Whether the path is drawn
+    wall_color, logo_color: The wall and logo colors, as 0xRRGGBBAA
+
+    Raises:
+    ValueError: The cell size or the file extension is not supported
+    """
+    rows = line_rows(binary.hex_rows(), binary.cols, binary.rows,
+                     binary.entry, binary.exit, binary.path, cell_size,
+                     show_path)
+    write_image(file_path, rows, binary.cols, binary.rows, cell_size,
+                palette(wall_color, logo_color))
+
+
+def write_image(file_path: str, rows: Iterable[bytes], cols: int,
+                nbr_rows: int, cell_size: int, colors: list[int]) -> None:
+    """Write rendered rows in a PNG or PPM file
+
+    Args:
+    file_path: The image path, its extension giving the format
+    rows: The palette index rows
+    cols, nbr_rows: The maze size
+    cell_size: The cell size in pixel
+    colors: The color of every palette index, as 0xRRGGBBAA
+
+    Raises:
+    ValueError: The cell size or the file extension is not supported
+    """
+    if (cell_size < 2):
+        raise ValueError("The cell size must be at least 2")
+    suffix = Path(file_path).suffix.lower()
+    if (suffix not in (".png", ".ppm")):
+        raise ValueError(f"Unsupported image format '{suffix}'")
+    width = cols * cell_size + 1
+    height = nbr_rows * cell_size + 1
+    with open(file_path, "wb") as file:
+        if (suffix == ".png"):
+            write_png(file, rows, width, height, colors)
+        else:
+            write_ppm(file, rows, width, height, colors)
+
+
+if (__name__ == "__main__"):
+    from srcs.maze.maze_parser import MazeParser
+    args = ArgumentParser(description="Render maze files as images")
+    args.add_argument("mazes", nargs="+", help="maze files")
+    args.add_argument("-o", "--output", default=".",
+                      help="directory of the images")
+    args.add_argument("-f", "--format", choices=["png", "ppm"],
+                      default="png", help="image format")
+    args.add_argument("-c", "--cell-size", type=int, default=4,
+                      help="cell size in pixel")
+    args.add_argument("--no-path", action="store_true",
+                      help="do not draw the solution")
+    opts = args.parse_args()
+    try:
+        images: dict[Path, str] = {}
+        for file in opts.mazes:
+            image = Path(opts.output) / f"{Path(file).stem}.{opts.format}"
+            if (image in images):
+                raise ValueError(f"{file} and {images[image]} would both "
+                                 f"be rendered in {image}")
+            images[image] = file
+        for image, file in images.items():
+            if (is_binary(file)):
+                with BinaryMaze(file) as binary:
+                    export_binary_image(binary, str(image), opts.cell_size,
+                                        not opts.no_path)
+            else:
+                maze = MazeParser(file).extract()
+                if (maze is None):
+                    raise ValueError(f"The maze {file} is invalid")
+                export_image(maze, str(image), opts.cell_size,
+                             not opts.no_path)
+            print(f"{file} -> {image}")
+    except Exception as e:
+        print(e)
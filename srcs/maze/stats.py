@@ -0,0 +1,128 @@
+import json
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Timer:
+    """Timings of one measured operation
+    """
+
+    __slots__ = ("calls", "total", "last", "worst")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.worst = 0.0
+
+    def add(self, spent: float) -> None:
+        """Record one run
+
+        Args:
+        spent: The run time in seconds
+        """
+        self.calls += 1
+        self.total += spent
+        self.last = spent
+        self.worst = max(self.worst, spent)
+
+
+class Stats:
+    """
+    The Stats obj keeps the timers and counters of the display, only
+    recording anything while enabled
+
+    Args:
+    enabled: Whether recording starts enabled
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.timers: dict[str, Timer] = {}
+        self.counters: dict[str, int] = {}
+
+    def add_time(self, name: str, spent: float) -> None:
+        """Record one run of a timer
+
+        Args:
+        name: The timer name
+        spent: The run time in seconds
+        """
+        if (self.enabled):
+            self.timers.setdefault(name, Timer()).add(spent)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter
+
+        Args:
+        name: The counter name
+        value: The amount added
+        """
+        if (self.enabled):
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def lines(self) -> list[str]:
+        """Format the stats for the overlay
+
+        Returns:
+        One line per timer, with its last, average and worst time in ms,
+        then one line per counter
+        """
+        out = [f"{'':<12}{'last':>7}{'avg':>7}{'max':>7}  calls"]
+        for name, timer in sorted(self.timers.items()):
+            out.append(f"{name:<12}{timer.last * 1000:>7.1f}"
+                       f"{timer.total / timer.calls * 1000:>7.1f}"
+                       f"{timer.worst * 1000:>7.1f}  {timer.calls}")
+        for name, value in sorted(self.counters.items()):
+            out.append(f"{name:<19}{value:>14}")
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the stats as plain data
+
+        Returns:
+        The timers, in seconds, and the counters
+        """
+        return {
+            "timers": {name: {"calls": timer.calls, "total": timer.total,
+                              "last": timer.last, "max": timer.worst}
+                       for name, timer in self.timers.items()},
+            "counters": dict(self.counters),
+        }
+
+    def dump(self, file_path: str) -> None:
+        """Write the stats in a JSON file
+
+        Args:
+        file_path: The output file
+        """
+        with open(file_path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Time a method in the stats of its object, self.stats
+    When the stats are disabled the method runs after a single check
+
+    Args:
+    name: The timer name
+
+    Returns:
+    The method decorator
+    """
+    def decorator(method: F) -> F:
+        @wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            stats: Stats = self.stats
+            if (not stats.enabled):
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                stats.add_time(name, perf_counter() - start)
+        return cast(F, wrapper)
+    return decorator
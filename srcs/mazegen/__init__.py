@@ -1,7 +1,10 @@
 """Maze generation module using DFS algorithm with A* pathfinding solver"""
 
-from .maze_gen import Maze, MazeGen, AStar
+from .maze_gen import Maze, MazeGen, AStar, TreeSolver
+from .junctions import JunctionGraph
 from .config_parser import Config
+from .batch import generate_many, generate_one
 
 __version__ = "1.0.0"
-__all__ = ["Maze", "MazeGen", "AStar", "Config"]
+__all__ = ["Maze", "MazeGen", "AStar", "TreeSolver", "JunctionGraph",
+           "Config", "generate_many", "generate_one"]
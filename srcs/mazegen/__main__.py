@@ -0,0 +1,29 @@
+from argparse import ArgumentParser
+from srcs.mazegen.batch import generate_many, variants
+from srcs.mazegen.config_parser import Config, ConfigParser
+
+
+if (__name__ == "__main__"):
+    args = ArgumentParser(description="Generate mazes in batch")
+    args.add_argument("configs", nargs="+", help="config files")
+    args.add_argument("-w", "--workers", type=int, default=None,
+                      help="number of processes (one per cpu by default)")
+    args.add_argument("-n", "--count", type=int, default=1,
+                      help="number of mazes per config file")
+    args.add_argument("-c", "--chunk-size", type=int, default=4,
+                      help="number of mazes sent to a process at once")
+    opts = args.parse_args()
+    try:
+        configs: list[Config] = []
+        for file in opts.configs:
+            config = ConfigParser(file).extract()
+            if (config is None):
+                raise ValueError(f"The config {file} is invalid")
+            configs.append(config)
+        batch = (variant for config in configs
+                 for variant in variants(config, opts.count))
+        for i, maze in generate_many(batch, opts.workers, opts.chunk_size):
+            print(f"{i}: {maze.nbr_cols}x{maze.nbr_rows} seed={maze.seed} "
+                  f"path={len(maze.path)}")
+    except Exception as e:
+        print(e)
@@ -0,0 +1,127 @@
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                wait)
+from itertools import islice
+from os import cpu_count, devnull, path
+from typing import Iterable, Iterator
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.maze_cache import MazeCache
+from srcs.mazegen.maze_gen import Maze, MazeGen
+
+
+def generate_one(config: Config) -> Maze:
+    """Generate, solve and export one maze
+    Seeded mazes are taken from the cache of the config when there is one
+
+    Args:
+    config: The maze config
+
+    Returns:
+    The exported Maze
+    """
+    cache = MazeCache.of(config)
+    maze = cache.get(config) if cache else None
+    if (maze is None):
+        gen = MazeGen(config)
+        gen.generate()
+        maze = gen.maze_obj(gen.grid_repr(), gen.solution(True))
+        if (cache is not None):
+            cache.put(config, maze)
+    maze.export_file(config.output_file)
+    return maze
+
+
+def generate_chunk(chunk: list[tuple[int, Config]]) \
+        -> list[tuple[int, Maze]]:
+    """Generate a chunk of mazes in a worker process
+
+    Args:
+    chunk: The configs with their index in the batch
+
+    Returns:
+    The mazes with their index in the batch
+    """
+    return [(i, generate_one(config)) for i, config in chunk]
+
+
+def unique_outputs(configs: Iterable[Config]) -> Iterator[Config]:
+    """Pass the configs through, checking that no two of them write the
+    same output file, which their workers would race on
+
+    Args:
+    configs: The maze configs, may be a lazy iterable
+
+    Returns:
+    An iterator over the same configs
+
+    Raises:
+    ValueError: An output file is shared, the null device aside
+    """
+    seen: set[str] = set()
+    null = path.realpath(devnull)
+    for config in configs:
+        output = path.realpath(config.output_file)
+        if output in seen:
+            raise ValueError(f"Several configs write {config.output_file}, "
+                             "number them with variants()")
+        if output != null:
+            seen.add(output)
+        yield config
+
+
+def generate_many(configs: Iterable[Config], workers: int | None = None,
+                  chunk_size: int = 4) -> Iterator[tuple[int, Maze]]:
+    """Generate, solve and export mazes across a pool of processes
+    Configs are sent in chunks, at most two chunks per worker at a time,
+    and results are yielded as soon as their chunk completes: the order
+    is not kept, but seeded configs always give the same mazes
+    A config is checked before being sent, the batch stopping at the first
+    one whose output file an earlier config already writes
+
+    Args:
+    configs: The maze configs, may be a lazy iterable
+    workers: The number of processes, one per cpu by default
+    chunk_size: The number of configs sent to a worker at once
+
+    Returns:
+    An iterator over (index of the config, Maze)
+
+    Raises:
+    ValueError: Two configs share an output file
+    """
+    workers = workers or cpu_count() or 1
+    todo = enumerate(unique_outputs(configs))
+    with ProcessPoolExecutor(workers) as pool:
+        pending: set[Future[list[tuple[int, Maze]]]] = set()
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(todo, chunk_size))
+                if not chunk:
+                    break
+                pending.add(pool.submit(generate_chunk, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def variants(config: Config, count: int) -> Iterator[Config]:
+    """Derive count configs from one, with consecutive seeds and numbered
+    output files
+
+    Args:
+    config: The base config
+    count: The number of variants
+
+    Returns:
+    An iterator over the variants
+    """
+    if count == 1:
+        yield config
+        return
+    root, ext = path.splitext(config.output_file)
+    for i in range(count):
+        yield config.model_copy(update={
+            "seed": config.seed + i if config.seed else None,
+            "output_file": f"{root}_{i}{ext}",
+        })
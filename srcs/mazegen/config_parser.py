@@ -15,6 +15,13 @@ class Config(BaseModel):
     perfect: bool = Field()
     seed: int | None = Field(default=None)
     shape: str = Field(default="rectangle")
+    algorithm: str = Field(default="dfs")
+    display: str = Field(default="mlx")
+    prefetch: int = Field(default=1, ge=0)
+    prefetch_cells: int = Field(default=1_000_000, ge=0)
+    stats_file: str | None = Field(default=None)
+    cache_dir: str | None = Field(default=None)
+    cache_size: int = Field(default=256, ge=0)
 
     @field_validator("entry", "exit", mode="before")
     @classmethod
@@ -51,6 +58,20 @@ class Config(BaseModel):
         except ValueError:
             raise ValueError(f"{info.field_name} must contain integers")
 
+    @field_validator("display", mode="before")
+    @classmethod
+    def parse_display(cls, raw: str) -> str:
+        """Make the display field case insensitive
+
+        Args:
+        cls: The Config class itself
+        raw: The raw display value
+
+        Returns:
+        The lower case display value
+        """
+        return (raw.strip().lower())
+
     @model_validator(mode="after")
     def check_valid_coords(self) -> Self:
         """Check after the Pydantic validation if the info are coherent
@@ -71,6 +92,14 @@ class Config(BaseModel):
         if (self.shape not in ["rectangle", "square", "circle", "donut",
                                "diamond", "ellipse"]):
             raise ValueError("Shape not known")
+        if (self.display not in ["mlx", "none"]):
+            raise ValueError("Display must be MLX or NONE")
+        if (self.algorithm not in ["dfs", "eller", "kruskal", "wilson"]):
+            raise ValueError("Algorithm not known")
+        if (self.algorithm == "eller"
+                and (self.shape != "rectangle" or not self.perfect)):
+            raise ValueError("The eller algorithm only generates perfect "
+                             "rectangle mazes")
         if (self.shape in ["square", "circle", "donut", "diamond"]
                 and min(self.width, self.height) <= 1):
             raise ValueError("The shape selected will shrink the size and will"
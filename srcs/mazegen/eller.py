@@ -0,0 +1,106 @@
+import random
+from array import array
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.grid import HEXA_TABLE, new_grid
+from srcs.mazegen.maze_file import open_maze_file
+from typing import Iterator
+
+
+def find(parent: list[int], x: int) -> int:
+    """Find the set of column x, halving the path on the way
+
+    Args:
+    parent: The parent of every column of the row
+    x: The column
+
+    Returns:
+    The column representing the set
+    """
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def eller_rows(width: int, height: int,
+               rng: random.Random) -> Iterator[array]:
+    """Generate a perfect maze one row at a time with Eller's algorithm
+    Only the sets of the current row are kept, so the memory is bounded by
+    the width
+
+    Args:
+    width, height: The maze size
+    rng: The random generator to draw from
+
+    Returns:
+    An iterator over the rows, as flat grids of wall nibbles
+    """
+    above: list[int] = [-1] * width
+    for y in range(height):
+        last: bool = y == height - 1
+        row: array = new_grid(width)
+        parent: list[int] = list(range(width))
+        first: dict[int, int] = {}
+        for x in range(width):
+            if above[x] < 0:
+                continue
+            row[x] -= 1
+            if above[x] in first:
+                parent[x] = first[above[x]]
+            else:
+                first[above[x]] = x
+
+        for x in range(width - 1):
+            a, b = find(parent, x), find(parent, x + 1)
+            if a != b and (last or rng.random() < 0.5):
+                row[x] -= 2
+                row[x + 1] -= 8
+                parent[b] = a
+
+        if last:
+            yield row
+            return
+        members: dict[int, list[int]] = {}
+        for x in range(width):
+            members.setdefault(find(parent, x), []).append(x)
+        above = [-1] * width
+        for root, cols in members.items():
+            down: list[int] = [x for x in cols if rng.random() < 0.5]
+            if not down:
+                down = [rng.choice(cols)]
+            for x in down:
+                row[x] -= 4
+                above[x] = root
+        yield row
+
+
+class EllerGen:
+    """
+    The EllerGen obj streams perfect rectangle mazes straight to the
+    output file, without ever holding the whole maze in memory
+    The solution needs the whole maze, so the path line is left empty
+    """
+
+    def __init__(self, conf: Config):
+        self.width = conf.width
+        self.height = conf.height
+        self.entry = conf.entry
+        self.exit = conf.exit
+        self.output_file = conf.output_file
+        if (conf.seed):
+            self.seed = conf.seed
+        else:
+            self.seed = random.randint(0, 2**32 - 1)
+        self.rng = random.Random(self.seed)
+
+    def export_maze_file(self) -> None:
+        """
+        generate the maze and write it row by row in the output file
+        """
+        with open_maze_file(self.output_file) as f:
+            for row in eller_rows(self.width, self.height, self.rng):
+                f.write(row.tobytes().translate(HEXA_TABLE))
+                f.write(b"\n")
+            f.write(f"\n{self.entry[0]},{self.entry[1]}\n\
+{self.exit[0]},{self.exit[1]}\n".encode())
+        print("The solution is not computed for streamed mazes")
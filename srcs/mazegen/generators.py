@@ -0,0 +1,175 @@
+from abc import ABC, abstractmethod
+from array import array
+from srcs.mazegen.grid import BitSet
+from srcs.mazegen.union_find import UnionFind
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from srcs.mazegen.maze_gen import MazeGen
+
+# Bumped whenever a change gives other mazes or paths for the same seed, so
+# that the cached mazes of the previous version are not used anymore
+GENERATOR_VERSION = 2
+
+
+class Generator(ABC):
+    """Base class of the generation algorithms
+    A generator digs the walls of a MazeGen grid in place, once the shape
+    and the 42 logo are stamped: visited cells are never dug into
+
+    Args:
+    maze: The MazeGen to dig
+    """
+
+    def __init__(self, maze: "MazeGen") -> None:
+        self.maze = maze
+
+    def carve(self) -> None:
+        """Dig the maze"""
+        for _ in self.steps():
+            pass
+
+    @abstractmethod
+    def steps(self) -> Iterator[None]:
+        """Dig the maze, pausing after every dug wall"""
+
+
+class DFSGenerator(Generator):
+    """Randomized depth first search
+    Instead of a stack, every dug cell remembers the direction of the cell
+    it was dug from, so backtracking only needs one byte per cell
+    These parent directions are kept in maze.parents: the path of a perfect
+    maze is read from them by walking up from the exit
+    """
+
+    def steps(self) -> Iterator[None]:
+        """Dig the maze, pausing after every dug wall"""
+        maze = self.maze
+        back: bytearray = bytearray(len(maze.lst_repr))
+        maze.parents = back
+        root: int = maze.index(maze.entry)
+        exit: int = maze.index(maze.exit)
+        current: int = root
+        while True:
+            maze.visited.add(current)
+            neighbors: list[int] = []
+            if current != exit:
+                neighbors = maze.neighbors(current)
+            if not neighbors:
+                if current == root:
+                    break
+                current = maze.step(current, back[current])
+                continue
+
+            maze.rng.shuffle(neighbors)
+            maze.dig_wall(current, neighbors[0])
+            current = maze.step(current, neighbors[0])
+            back[current] = (neighbors[0] + 2) % 4
+            yield
+
+
+class KruskalGenerator(Generator):
+    """Randomized Kruskal: walls are dug in a random order whenever they
+    separate two cells that are not connected yet
+    """
+
+    def steps(self) -> Iterator[None]:
+        """Dig the maze, pausing after every dug wall"""
+        maze = self.maze
+        w: int = maze.width
+        size: int = len(maze.lst_repr)
+        visited: BitSet = maze.visited
+        edges: array = array("I")
+        for i in range(size):
+            if visited[i]:
+                continue
+            if (i + 1) % w and not visited[i + 1]:
+                edges.append(i << 1)
+            if i + w < size and not visited[i + w]:
+                edges.append(i << 1 | 1)
+        maze.rng.shuffle(edges)
+
+        sets: UnionFind = UnionFind(size)
+        for edge in edges:
+            i = edge >> 1
+            if edge & 1:
+                if sets.union(i, i + w):
+                    maze.dig_wall(i, 2)
+                    yield
+            elif sets.union(i, i + 1):
+                maze.dig_wall(i, 1)
+                yield
+
+
+class WilsonGenerator(Generator):
+    """Wilson's algorithm: loop-erased random walks from every cell until
+    they hit the tree grown from the entry, giving a uniform spanning tree
+    """
+
+    def reachable(self) -> BitSet:
+        """Flood the free cells from the entry, so walks never start in a
+        region cut off by the shape or the logo
+
+        Returns:
+        The cells connected to the entry
+        """
+        maze = self.maze
+        region: BitSet = BitSet(len(maze.lst_repr))
+        todo: list[int] = [maze.index(maze.entry)]
+        region.add(todo[0])
+        while todo:
+            current = todo.pop()
+            for direction in maze.neighbors(current):
+                nxt = maze.step(current, direction)
+                if not region[nxt]:
+                    region.add(nxt)
+                    todo.append(nxt)
+        return region
+
+    def steps(self) -> Iterator[None]:
+        """Dig the maze, pausing after every dug wall"""
+        maze = self.maze
+        region: BitSet = self.reachable()
+        tree: BitSet = maze.visited
+        walk: bytearray = bytearray(len(maze.lst_repr))
+        tree.add(maze.index(maze.entry))
+        for start in range(len(maze.lst_repr)):
+            if not region[start] or tree[start]:
+                continue
+            current: int = start
+            while not tree[current]:
+                moves = [d for d in self.moves(current)
+                         if region[maze.step(current, d)]]
+                walk[current] = maze.rng.choice(moves)
+                current = maze.step(current, walk[current])
+            current = start
+            while not tree[current]:
+                tree.add(current)
+                maze.dig_wall(current, walk[current])
+                current = maze.step(current, walk[current])
+                yield
+
+    def moves(self, i: int) -> list[int]:
+        """Directions of the cells next to i inside the grid
+
+        Args:
+        i: The cell index
+        """
+        maze = self.maze
+        output: list[int] = []
+        if i % maze.width:
+            output.append(3)
+        if (i + 1) % maze.width:
+            output.append(1)
+        if i >= maze.width:
+            output.append(0)
+        if i + maze.width < len(maze.lst_repr):
+            output.append(2)
+        return output
+
+
+GENERATORS: dict[str, type[Generator]] = {
+    "dfs": DFSGenerator,
+    "kruskal": KruskalGenerator,
+    "wilson": WilsonGenerator,
+}
@@ -0,0 +1,45 @@
+from array import array
+
+HEXA_TABLE: bytes = bytes.maketrans(bytes(range(16)) + b"\xff",
+                                    b"0123456789ABCDEF ")
+
+
+def new_grid(size: int, value: int = 15) -> array:
+    """Allocate a flat grid of signed bytes, one per cell
+
+    Args:
+    size: The number of cells
+    value: The initial value of every cell
+
+    Returns:
+    The grid, indexed by y * width + x
+    """
+    return array("b", [value]) * size
+
+
+class BitSet:
+    """Fixed size set of cell indexes stored as one bit per cell
+
+    Args:
+    size: The number of cells
+    """
+
+    __slots__ = ("bits", "size")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> int:
+        return (self.bits[i >> 3] >> (i & 7)) & 1
+
+    def add(self, i: int) -> None:
+        """Set the bit of cell i"""
+        self.bits[i >> 3] |= 1 << (i & 7)
+
+    def discard(self, i: int) -> None:
+        """Clear the bit of cell i"""
+        self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
@@ -0,0 +1,295 @@
+import re
+from array import array
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from srcs.mazegen.maze_gen import MazeGen
+
+LETTERS: bytes = bytes.maketrans(b"\x00\x01\x02\x03", b"NESW")
+OPPOSITE: bytes = bytes.maketrans(b"NESW", b"SWNE")
+# Open directions of a cell, indexed by its walls (255 for the cells
+# outside of the shape), and the way out of a corridor cell, indexed by its
+# walls * 4 + the direction it was entered from
+DEGREES: bytes = bytes(4 - bin(walls).count("1") if walls < 16 else 0
+                       for walls in range(256))
+NEXT: bytes = bytes(next((d for d in range(4)
+                          if not walls >> d & 1 and d != back), 255)
+                    for walls in range(16) for back in range(4))
+NODE_DEGREES: re.Pattern[bytes] = re.compile(b"[\x01\x03\x04]")
+CORRIDOR_DEGREE: re.Pattern[bytes] = re.compile(b"\x02")
+
+# (node, edge, begin, end): a node reached along an edge, moving from the
+# offset begin to the offset end of the corridor, -1 being the start cell
+# for the node and no corridor for the edge
+Hop = Tuple[int, int, int, int]
+
+
+class JunctionGraph:
+    """Maze contracted into a weighted graph: its nodes are the junctions,
+    the dead ends and the kept cells (entry and exit), its edges are the
+    corridors between them, weighted by their length
+    A corridor is only stored as its first direction and its length, and
+    every corridor cell remembers its corridor and its offset in it, so
+    any cell can be searched from or to
+    Paths are searched in the graph then expanded back into directions by
+    walking the corridors they take, so the graph can answer many queries
+    on the same maze
+
+    Args:
+    grid: The walls of every cell, -1 outside of the shape
+    width: The maze width
+    keep: Cells made nodes even inside a corridor
+    """
+
+    def __init__(self, grid: array, width: int,
+                 keep: Iterable[int] = ()) -> None:
+        self.grid = grid
+        self.width = width
+        self.offsets: tuple[int, ...] = (-width, 1, width, -1)
+        size: int = len(grid)
+        degrees: bytes = grid.tobytes().translate(DEGREES)
+        self.node_of: array = array("i", [-1]) * size
+        self.cells: array = array("I")
+        self.adjacency: list[list[tuple[int, int, int]]] = []
+        self.starts: array = array("I")
+        self.stops: array = array("I")
+        self.firsts: bytearray = bytearray()
+        self.lengths: array = array("I")
+        self.corridor: array = array("i", [-1]) * size
+        self.position: array = array("I", [0]) * size
+        # Offset of the next cell and direction it is entered from, for a
+        # corridor cell indexed by its walls * 4 + its entry direction
+        self.shifts: tuple[int, ...] = tuple(
+            self.offsets[d] if d < 4 else 0 for d in NEXT)
+        self.turns: bytes = bytes(d ^ 2 if d < 4 else 0 for d in NEXT)
+        for cell in keep:
+            if degrees[cell]:
+                self.add_node(cell)
+        for found in NODE_DEGREES.finditer(degrees):
+            self.add_node(found.start())
+        for cell in list(self.cells):
+            self.walk_from(cell)
+        if len(self.cells) + sum(self.lengths) - len(self.lengths) \
+                < size - degrees.count(0):
+            # Corridors looping on themselves, without any node
+            for found in CORRIDOR_DEGREE.finditer(degrees):
+                cell = found.start()
+                if self.corridor[cell] < 0 and self.node_of[cell] < 0:
+                    self.add_node(cell)
+                    self.walk_from(cell)
+
+    @classmethod
+    def of(cls, maze: "MazeGen") -> "JunctionGraph":
+        """Contract a generated maze, keeping its entry and exit as nodes
+
+        Args:
+        maze: The generated maze
+
+        Returns:
+        The graph
+        """
+        return cls(maze.lst_repr, maze.width,
+                   (maze.index(maze.entry), maze.index(maze.exit)))
+
+    def add_node(self, cell: int) -> int:
+        """Make a cell a node
+
+        Args:
+        cell: The cell index
+
+        Returns:
+        The node id
+        """
+        node: int = self.node_of[cell]
+        if node < 0:
+            node = self.node_of[cell] = len(self.cells)
+            self.cells.append(cell)
+            self.adjacency.append([])
+        return node
+
+    def walk_from(self, cell: int) -> None:
+        """Follow every corridor leaving a node that was not followed yet
+        from its other end, adding it as an edge
+
+        Args:
+        cell: The node cell
+        """
+        grid, node_of, corridor, position = self.grid, self.node_of, \
+            self.corridor, self.position
+        shifts, turns = self.shifts, self.turns
+        for direction in range(4):
+            if grid[cell] >> direction & 1:
+                continue
+            current: int = cell + self.offsets[direction]
+            if corridor[current] >= 0 \
+                    or (node_of[current] >= 0 and current < cell):
+                continue
+            edge: int = len(self.lengths)
+            back: int = direction ^ 2
+            length: int = 1
+            while node_of[current] < 0:
+                corridor[current] = edge
+                position[current] = length
+                key = grid[current] * 4 + back
+                current += shifts[key]
+                back = turns[key]
+                length += 1
+            self.starts.append(cell)
+            self.stops.append(current)
+            self.firsts.append(direction)
+            self.lengths.append(length)
+            self.adjacency[node_of[cell]].append(
+                (node_of[current], edge, 0))
+            self.adjacency[node_of[current]].append(
+                (node_of[cell], edge, length))
+
+    def corridor_path(self, edge: int) -> bytes:
+        """Expand a corridor into directions
+
+        Args:
+        edge: The corridor
+
+        Returns:
+        Its directions, from its start node, as N, E, S, W letters
+        """
+        grid, offsets = self.grid, self.offsets
+        length: int = self.lengths[edge]
+        out: bytearray = bytearray(length)
+        direction: int = self.firsts[edge]
+        current: int = self.starts[edge]
+        for k in range(length - 1):
+            out[k] = direction
+            current += offsets[direction]
+            direction = NEXT[grid[current] * 4 + (direction ^ 2)]
+        out[length - 1] = direction
+        return bytes(out).translate(LETTERS)
+
+    def segment(self, edge: int, begin: int, end: int) -> bytes:
+        """Directions along a corridor between two offsets
+
+        Args:
+        edge: The corridor, -1 for none
+        begin, end: The offsets, the path going from begin to end
+
+        Returns:
+        The directions, as N, E, S, W letters
+        """
+        if edge < 0 or begin == end:
+            return b""
+        path = self.corridor_path(edge)
+        if begin < end:
+            return path[begin:end]
+        return path[end:begin][::-1].translate(OPPOSITE)
+
+    def ends(self, cell: int, leaving: bool) -> list[Hop]:
+        """Get how a cell joins the graph
+
+        Args:
+        cell: The cell index
+        leaving: Whether the path leaves the cell or reaches it
+
+        Returns:
+        The hops between the cell and the nodes closest to it, with no
+        corridor when the cell is a node, none when it joins no node
+        """
+        node: int = self.node_of[cell]
+        if node >= 0:
+            return [(node, -1, 0, 0)]
+        edge: int = self.corridor[cell]
+        if edge < 0:
+            return []
+        offset: int = self.position[cell]
+        hops: list[Hop] = []
+        for stop, at in ((self.starts[edge], 0),
+                         (self.stops[edge], self.lengths[edge])):
+            if leaving:
+                hops.append((self.node_of[stop], edge, offset, at))
+            else:
+                hops.append((self.node_of[stop], edge, at, offset))
+        return hops
+
+    def h(self, node: int, goal: int) -> int:
+        """Manhattan distance between a node and the goal cell"""
+        cell: int = self.cells[node]
+        y, x = divmod(cell, self.width)
+        gy, gx = divmod(goal, self.width)
+        return abs(x - gx) + abs(y - gy)
+
+    def solve(self, src: Tuple[int, int], dest: Tuple[int, int]) \
+            -> str | None:
+        """Find a shortest path between two cells with A* over the nodes,
+        the manhattan distance being a lower bound of every corridor length
+
+        Args:
+        src, dest: The cell coordinates
+
+        Returns:
+        The path directions, as N, E, S, W letters, or None when the cells
+        are not connected
+        """
+        start: int = src[1] * self.width + src[0]
+        goal: int = dest[1] * self.width + dest[0]
+        if start == goal:
+            return ""
+        lengths: array = self.lengths
+        best: int | None = None
+        last: Hop | None = None
+        if self.corridor[start] >= 0 \
+                and self.corridor[start] == self.corridor[goal]:
+            best = abs(self.position[start] - self.position[goal])
+            last = (-1, self.corridor[start], self.position[start],
+                    self.position[goal])
+        finish: dict[int, Hop] = {}
+        for hop in self.ends(goal, False):
+            if hop[0] not in finish or abs(hop[3] - hop[2]) \
+                    < abs(finish[hop[0]][3] - finish[hop[0]][2]):
+                finish[hop[0]] = hop
+        g: dict[int, int] = {}
+        came_from: dict[int, Hop] = {}
+        heap: list[tuple[int, int]] = []
+        for node, edge, begin, end in self.ends(start, True):
+            cost = abs(end - begin)
+            if node not in g or cost < g[node]:
+                g[node] = cost
+                came_from[node] = (-1, edge, begin, end)
+                heappush(heap, (cost + self.h(node, goal), node))
+        closed: set[int] = set()
+        while heap:
+            f, node = heappop(heap)
+            if best is not None and f >= best:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            reach = finish.get(node)
+            if reach is not None:
+                cost = g[node] + abs(reach[3] - reach[2])
+                if best is None or cost < best:
+                    best, last = cost, reach
+            for nxt, edge, at in self.adjacency[node]:
+                cost = g[node] + lengths[edge]
+                if nxt not in closed and (nxt not in g or cost < g[nxt]):
+                    g[nxt] = cost
+                    came_from[nxt] = (node, edge, at, lengths[edge] - at)
+                    heappush(heap, (cost + self.h(nxt, goal), nxt))
+        if last is None:
+            return None
+        return self.expand(last, came_from)
+
+    def expand(self, last: Hop, came_from: dict[int, Hop]) -> str:
+        """Turn the hops of a search into the path directions
+
+        Args:
+        last: The hop reaching the goal cell
+        came_from: The hop every node was reached with
+
+        Returns:
+        The path directions, as N, E, S, W letters
+        """
+        node, edge, begin, end = last
+        parts: list[bytes] = [self.segment(edge, begin, end)]
+        while node >= 0:
+            node, edge, begin, end = came_from[node]
+            parts.append(self.segment(edge, begin, end))
+        return b"".join(reversed(parts)).decode()
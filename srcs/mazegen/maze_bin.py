@@ -0,0 +1,363 @@
+import mmap
+import struct
+from types import TracebackType
+from typing import IO, Iterator, Tuple
+from srcs.mazegen.maze_file import open_maze_file
+from srcs.mazegen.maze_gen import Maze
+
+MAGIC = b"AMZB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIIIIIIQQ")
+HAS_SEED = 1
+HAS_MASK = 2
+
+HEX_DIGITS = b"0123456789ABCDEF"
+NIBBLES: bytes = bytes.maketrans(HEX_DIGITS + b" ", bytes(range(16)) + b"\x00")
+OUTSIDE: bytes = bytes.maketrans(HEX_DIGITS + b" ", b"\x00" * 16 + b"\x01")
+HIGH_DIGITS: bytes = bytes(HEX_DIGITS[b >> 4] for b in range(256))
+LOW_DIGITS: bytes = bytes(HEX_DIGITS[b & 15] for b in range(256))
+BIT_FLAGS: list[bytes] = [bytes(0xFF if b >> k & 1 else 0 for b in range(256))
+                          for k in range(8)]
+
+
+def pack_row(row: bytes, cols: int) -> Tuple[bytes, bytes]:
+    """Pack a row of hexadecimal cells, two cells per byte
+
+    Args:
+    row: The hexadecimal cells, spaces being outside of the shape
+    cols: The maze width
+
+    Returns:
+    The packed cells, the even cell in the high nibble, and the mask of
+    the row, one bit per cell set outside of the shape
+    """
+    row = row[:cols].ljust(cols)
+    values = row.translate(NIBBLES) + b"\x00"
+    half = (cols + 1) // 2
+    packed = (int.from_bytes(values[0:half * 2:2], "big") << 4
+              | int.from_bytes(values[1:half * 2:2], "big"))
+    size = (cols + 7) // 8
+    outside = row.translate(OUTSIDE).ljust(size * 8, b"\x00")
+    mask = 0
+    for k in range(8):
+        mask |= int.from_bytes(outside[k::8], "big") << k
+    return packed.to_bytes(half, "big"), mask.to_bytes(size, "big")
+
+
+def unpack_row(packed: bytes, mask: bytes | None, cols: int) -> bytes:
+    """Unpack a row of cells into hexadecimal
+
+    Args:
+    packed: The packed cells
+    mask: The mask of the row, None when every cell is in the shape
+    cols: The maze width
+
+    Returns:
+    The hexadecimal cells, spaces being outside of the shape
+    """
+    digits = bytearray(len(packed) * 2)
+    digits[0::2] = packed.translate(HIGH_DIGITS)
+    digits[1::2] = packed.translate(LOW_DIGITS)
+    if (mask is None or not any(mask)):
+        return bytes(digits[:cols])
+    cells = bytearray(len(mask) * 8)
+    for k in range(8):
+        cells[k::8] = mask.translate(BIT_FLAGS[k])
+    flags = int.from_bytes(cells[:cols], "big")
+    spaces = int.from_bytes(b" " * cols, "big")
+    return (int.from_bytes(digits[:cols], "big") & ~flags
+            | spaces & flags).to_bytes(cols, "big")
+
+
+class BinaryWriter:
+    """
+    The BinaryWriter obj writes a maze in the binary format as its rows
+    come, the header being written last
+    The file holds the header, the packed cells row by row, the mask of
+    the cells outside of the shape if there is any, then the path
+    Only the mask is kept in memory until the rows are all written
+
+    Args:
+    file: The output file, seekable
+    cols: The maze width
+    """
+
+    def __init__(self, file: IO[bytes], cols: int) -> None:
+        self.file = file
+        self.cols = cols
+        self.rows = 0
+        self.masks = bytearray()
+        self.start = file.tell()
+        file.write(bytes(HEADER.size))
+
+    def add_row(self, row: bytes) -> None:
+        """Write the next row
+
+        Args:
+        row: The hexadecimal cells, spaces being outside of the shape
+        """
+        packed, mask = pack_row(row, self.cols)
+        self.file.write(packed)
+        self.masks += mask
+        self.rows += 1
+
+    def close(self, entry: Tuple[int, int], exit: Tuple[int, int],
+              seed: int | None, path: str) -> None:
+        """Write the mask, the path and the header
+
+        Args:
+        entry, exit: The entry and exit cells
+        seed: The maze seed, if known
+        path: The path directions
+        """
+        flags = HAS_SEED if seed is not None else 0
+        if (any(self.masks)):
+            flags |= HAS_MASK
+            self.file.write(self.masks)
+        encoded = path.encode()
+        self.file.write(encoded)
+        end = self.file.tell()
+        self.file.seek(self.start)
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, 0, self.cols,
+                                    self.rows, entry[0], entry[1], exit[0],
+                                    exit[1], seed or 0, len(encoded)))
+        self.file.seek(end)
+
+
+def write_maze(file: IO[bytes], maze: Maze) -> None:
+    """Write a Maze object in the binary format
+
+    Args:
+    file: The output file, seekable
+    maze: The maze
+    """
+    writer = BinaryWriter(file, maze.nbr_cols)
+    for line in maze.maze.split("\n")[:maze.nbr_rows]:
+        writer.add_row(line.encode())
+    writer.close(maze.entry, maze.exit, maze.seed, maze.path)
+
+
+def export_binary(maze: Maze, file_path: str) -> None:
+    """Write a Maze object in a binary maze file
+
+    Args:
+    maze: The maze
+    file_path: The output file
+    """
+    with open(file_path, "wb") as file:
+        write_maze(file, maze)
+
+
+def text_to_binary(text_file: str, file_path: str,
+                   seed: int | None = None) -> None:
+    """Convert a text maze file to the binary format, row by row
+
+    Args:
+    text_file: The text maze file, compressed according to its extension
+    file_path: The binary output file
+    seed: The maze seed, the text format not keeping it
+
+    Raises:
+    ValueError: The text file is not a valid maze file
+    """
+    with open_maze_file(text_file, "rb") as text, \
+            open(file_path, "wb") as file:
+        lines = (line.rstrip(b"\n") for line in text)
+        first = next(lines, b"")
+        writer = BinaryWriter(file, len(first))
+        line = first
+        while (line):
+            if (len(line) != writer.cols):
+                raise ValueError("Maze line are not the same size")
+            writer.add_row(line)
+            line = next(lines, b"")
+        footer = [next(lines, b"").decode() for _ in range(3)]
+        try:
+            entry, exit = (tuple(int(v) for v in coords.split(","))
+                           for coords in footer[:2])
+        except ValueError:
+            raise ValueError(f"{text_file} has invalid entry or exit")
+        if (len(entry) != 2 or len(exit) != 2):
+            raise ValueError(f"{text_file} has invalid entry or exit")
+        writer.close((entry[0], entry[1]), (exit[0], exit[1]), seed,
+                     footer[2])
+
+
+def is_binary(file_path: str) -> bool:
+    """Check whether a file is in the binary maze format
+
+    Args:
+    file_path: The file path
+
+    Returns:
+    True when the file starts with the format magic
+    """
+    with open(file_path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class BinaryMaze:
+    """
+    The BinaryMaze obj reads a binary maze file through a memory map, its
+    rows and cells being read from the file pages without loading it
+
+    Args:
+    file_path: The binary maze file
+
+    Raises:
+    ValueError: The file is not a valid binary maze
+    """
+
+    def __init__(self, file_path: str) -> None:
+        with open(file_path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if (len(self.map) < HEADER.size):
+            self.close()
+            raise ValueError(f"{file_path} is not a binary maze file")
+        (magic, version, flags, _, self.cols, self.rows, entry_x, entry_y,
+         exit_x, exit_y, seed, path_len) = HEADER.unpack_from(self.map)
+        self.row_len = (self.cols + 1) // 2
+        self.mask_len = (self.cols + 7) // 8
+        cells_end = HEADER.size + self.row_len * self.rows
+        self.mask_start = cells_end if flags & HAS_MASK else None
+        self.path_start = cells_end \
+            + (self.mask_len * self.rows if flags & HAS_MASK else 0)
+        if (magic != MAGIC or version != VERSION
+                or len(self.map) != self.path_start + path_len):
+            self.close()
+            raise ValueError(f"{file_path} is not a binary maze file")
+        self.entry = (entry_x, entry_y)
+        self.exit = (exit_x, exit_y)
+        self.seed: int | None = seed if flags & HAS_SEED else None
+        self.view = memoryview(self.map)
+
+    def __enter__(self) -> "BinaryMaze":
+        return self
+
+    def __exit__(self, kind: type[BaseException] | None,
+                 error: BaseException | None,
+                 trace: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map
+        The rows still in use keep it mapped until they are dropped
+        """
+        if (hasattr(self, "view")):
+            self.view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+
+    @property
+    def path(self) -> str:
+        """The path directions"""
+        return bytes(self.view[self.path_start:]).decode()
+
+    def row(self, y: int) -> memoryview:
+        """Get the packed cells of a row, without copying them
+
+        Args:
+        y: The row index
+
+        Returns:
+        The row bytes, two cells per byte, the even one in the high nibble
+        """
+        start = HEADER.size + y * self.row_len
+        return self.view[start:start + self.row_len]
+
+    def mask_row(self, y: int) -> memoryview | None:
+        """Get the mask of a row, without copying it
+
+        Args:
+        y: The row index
+
+        Returns:
+        The row mask, one bit per cell set outside of the shape, or None
+        when every cell of the maze is in the shape
+        """
+        if (self.mask_start is None):
+            return None
+        start = self.mask_start + y * self.mask_len
+        return self.view[start:start + self.mask_len]
+
+    def cell(self, x: int, y: int) -> int:
+        """Get the walls of a cell
+
+        Args:
+        x, y: The cell coordinates
+
+        Returns:
+        The wall bits of the cell, -1 outside of the shape
+        """
+        if (self.mask_start is not None
+                and self.map[self.mask_start + y * self.mask_len + (x >> 3)]
+                >> (x & 7) & 1):
+            return -1
+        byte: int = self.map[HEADER.size + y * self.row_len + (x >> 1)]
+        return byte & 15 if x & 1 else byte >> 4
+
+    def hex_row(self, y: int) -> bytes:
+        """Get a row in the hexadecimal text format
+
+        Args:
+        y: The row index
+
+        Returns:
+        The hexadecimal cells, spaces being outside of the shape
+        """
+        mask = self.mask_row(y)
+        return unpack_row(bytes(self.row(y)),
+                          None if mask is None else bytes(mask), self.cols)
+
+    def hex_rows(self) -> Iterator[bytes]:
+        """Get the rows in the hexadecimal text format
+
+        Returns:
+        An iterator over the rows
+        """
+        for y in range(self.rows):
+            yield self.hex_row(y)
+
+    def to_maze(self) -> Maze:
+        """Load the whole maze as a Maze object
+
+        Returns:
+        The Maze
+        """
+        return Maze(maze=b"\n".join(self.hex_rows()).decode(),
+                    entry=self.entry, exit=self.exit, path=self.path,
+                    nbr_cols=self.cols, nbr_rows=self.rows, seed=self.seed)
+
+    def export_text(self, output_file: str) -> None:
+        """Write the maze in the text format, row by row
+
+        Args:
+        output_file: The file path, compressed according to its extension
+        """
+        with open_maze_file(output_file) as file:
+            for row in self.hex_rows():
+                file.write(row + b"\n")
+            file.write(f"\n{self.entry[0]},{self.entry[1]}\n"
+                       f"{self.exit[0]},{self.exit[1]}\n{self.path}"
+                       .encode())
+
+
+if (__name__ == "__main__"):
+    from argparse import ArgumentParser
+    args = ArgumentParser(description="Convert a maze file between the "
+                          "text and the binary formats")
+    args.add_argument("source", help="maze file, text or binary")
+    args.add_argument("destination", help="converted maze file")
+    args.add_argument("-s", "--seed", type=int, default=None,
+                      help="seed kept in the binary file")
+    opts = args.parse_args()
+    try:
+        if (is_binary(opts.source)):
+            with BinaryMaze(opts.source) as binary:
+                binary.export_text(opts.destination)
+        else:
+            text_to_binary(opts.source, opts.destination, opts.seed)
+    except (OSError, ValueError) as e:
+        print(e)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import tempfile
+from pydantic import ValidationError
+from srcs.mazegen.config_parser import Config
+from srcs.mazegen.generators import GENERATOR_VERSION
+from srcs.mazegen.maze_bin import BinaryMaze, write_maze
+from srcs.mazegen.maze_gen import Maze
+
+CACHE_SUFFIX = ".amz"
+KEY_FIELDS = ("width", "height", "entry", "exit", "perfect", "seed",
+              "shape", "algorithm")
+
+
+class MazeCache:
+    """
+    The MazeCache obj keeps the generated mazes of seeded configs on disk,
+    in the binary maze format, one file per config
+    Files are written under a temporary name then renamed, so processes
+    sharing the directory never read a partial maze. Once the directory
+    holds more than limit bytes, the least recently used mazes are removed
+
+    Args:
+    directory: The cache directory, created if needed
+    limit: The size of the cache in bytes
+    """
+
+    def __init__(self, directory: str, limit: int) -> None:
+        self.directory = directory
+        self.limit = limit
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def of(cls, config: Config) -> "MazeCache | None":
+        """Get the cache of a config
+
+        Args:
+        config: The maze config
+
+        Returns:
+        The cache, or None when the config has no CACHE_DIR or no seed
+        (0 included, MazeGen drawing a random seed for it), unseeded mazes
+        being different every time, or uses eller, whose
+        mazes are streamed to the output file
+        """
+        if (config.cache_dir is None or not config.seed
+                or config.algorithm == "eller"):
+            return None
+        return cls(config.cache_dir, config.cache_size << 20)
+
+    @staticmethod
+    def key(config: Config) -> str:
+        """Hash the fields of a config that the maze depends on
+
+        Args:
+        config: The maze config
+
+        Returns:
+        The hexadecimal digest, which changes with the generator version
+        """
+        fields = {name: getattr(config, name) for name in KEY_FIELDS}
+        fields["version"] = GENERATOR_VERSION
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()) \
+            .hexdigest()
+
+    def file(self, config: Config) -> str:
+        """Get the cache file of a config
+
+        Args:
+        config: The maze config
+
+        Returns:
+        The file path
+        """
+        return os.path.join(self.directory, self.key(config) + CACHE_SUFFIX)
+
+    def get(self, config: Config) -> Maze | None:
+        """Load the maze of a config, marking it as recently used
+        A file that cannot be read is removed
+
+        Args:
+        config: The maze config
+
+        Returns:
+        The maze, or None if it is not cached
+        """
+        file = self.file(config)
+        try:
+            with BinaryMaze(file) as binary:
+                maze = binary.to_maze()
+            os.utime(file)
+            return maze
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, ValidationError):
+            self.remove(file)
+            return None
+
+    def put(self, config: Config, maze: Maze) -> None:
+        """Store the maze of a config, then evict the oldest mazes if the
+        cache is too big
+
+        Args:
+        config: The maze config
+        maze: The generated maze
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                write_maze(file, maze)
+            os.replace(tmp, self.file(config))
+        except OSError:
+            self.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used mazes until the cache fits in
+        its limit
+        """
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if (not entry.name.endswith(CACHE_SUFFIX)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if (total <= self.limit):
+                return
+            self.remove(path)
+            total -= size
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """Remove a file, which another process may have removed already
+
+        Args:
+        path: The file path
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,22 @@
+import gzip
+import lzma
+from typing import IO, Literal
+
+
+def open_maze_file(path: str, mode: Literal["rb", "wb"] = "wb") \
+        -> IO[bytes] | gzip.GzipFile | lzma.LZMAFile:
+    """Open a maze file in binary mode, compressed according to its extension
+
+    Args:
+    path: The file path, ending in .gz for gzip, .xz or .lzma for lzma,
+    anything else for a plain file
+    mode: The open mode, "rb" or "wb"
+
+    Returns:
+    The opened (buffered) file object
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    if path.endswith((".xz", ".lzma")):
+        return lzma.open(path, mode)
+    return open(path, mode)
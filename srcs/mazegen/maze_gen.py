@@ -1,14 +1,29 @@
 import random
+from array import array
+from heapq import heappush, heappop
 from math import sqrt
 from srcs.mazegen.config_parser import Config
-from typing import Tuple
+from srcs.mazegen.eller import eller_rows
+from srcs.mazegen.generators import GENERATORS, DFSGenerator, Generator
+from srcs.mazegen.grid import HEXA_TABLE, BitSet, new_grid
+from srcs.mazegen.junctions import JunctionGraph
+from srcs.mazegen.maze_file import open_maze_file
+from srcs.mazegen.shapes import apply_mask
+from typing import Iterator, Tuple
 from typing_extensions import Self
 from pydantic import (BaseModel, Field, field_validator,
                       ValidationInfo, model_validator)
 
 
+MAZE_CHARS = b"0123456789ABCDEF\n "
+PATH_CHARS = b"NSEW"
+
+
 class Maze(BaseModel):
-    """Maze object"""
+    """Maze object
+    Mazes read from files are validated, the ones built by MazeGen are
+    trusted and built without any check through Maze.trusted
+    """
     maze: str = Field()
     entry: Tuple[int, int] = Field(min_length=2, max_length=2)
     exit: Tuple[int, int] = Field(min_length=2, max_length=2)
@@ -68,49 +83,112 @@ class Maze(BaseModel):
             self.exit[0] < 0 or self.exit[0] >= self.nbr_cols or
                 self.exit[1] < 0 or self.exit[1] >= self.nbr_rows):
             raise ValueError("coords are out of bound")
-        for c in self.maze:
-            if (c not in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
-                          "A", "B", "C", "D", "E", "F", "\n", " "]):
-                raise ValueError(f"{c} is an invalid maze character")
-        for c in self.path:
-            if (c not in ["N", "S", "E", "W"]):
-                raise ValueError(f"{c} is an invalid path character")
+        if (self.maze.encode().translate(None, MAZE_CHARS)):
+            c = next(c for c in self.maze if c.encode() not in MAZE_CHARS)
+            raise ValueError(f"{c} is an invalid maze character")
+        if (self.path.encode().translate(None, PATH_CHARS)):
+            c = next(c for c in self.path if c.encode() not in PATH_CHARS)
+            raise ValueError(f"{c} is an invalid path character")
         self.maze = self.maze.rstrip("\n")
-        for line in self.maze.split("\n"):
-            if (len(line) != self.nbr_cols):
-                raise ValueError("Maze line are not the same size")
+        step = self.nbr_cols + 1
+        if ((len(self.maze) + 1) % step
+                or self.maze[self.nbr_cols::step].strip("\n")
+                or self.maze.count("\n") != (len(self.maze) + 1) // step - 1):
+            raise ValueError("Maze line are not the same size")
         return (self)
 
+    @classmethod
+    def trusted(cls, maze: str, entry: Tuple[int, int],
+                exit: Tuple[int, int], path: str, nbr_cols: int,
+                nbr_rows: int, seed: int | None) -> "Maze":
+        """Build a maze without validating it, for the mazes generated by
+        MazeGen which are valid by construction
+
+        Args:
+        maze: The maze, as hexadecimal lines
+        entry, exit: The entry and exit cells
+        path: The path directions
+        nbr_cols, nbr_rows: The maze size
+        seed: The maze seed
+
+        Returns:
+        The Maze, as the validated constructor would build it
+        """
+        return cls.model_construct(maze=maze.rstrip("\n"),
+                                   entry=(entry[0], entry[1]),
+                                   exit=(exit[0], exit[1]), path=path,
+                                   nbr_cols=nbr_cols, nbr_rows=nbr_rows,
+                                   seed=seed)
+
+    def export_file(self, output_file: str) -> None:
+        """Write the maze in a maze file
+
+        Args:
+        output_file: The file path, compressed according to its extension
+        """
+        with open_maze_file(output_file) as f:
+            f.write(f"{self.maze}\n\n{self.entry[0]},{self.entry[1]}\n"
+                    f"{self.exit[0]},{self.exit[1]}\n{self.path}".encode())
+
 
 class MazeGen:
     """
     The MazeGen obj aims to generate mazes using the dfs algorithm
     The int func takes a Config Obj and can export the Maze as a file or
     a Maze obj
+    Every random draw comes from self.rng, seeded with the maze seed, so
+    mazes can be generated concurrently
+    The maze is stored as a flat grid of one signed byte per cell (-1 for
+    cells outside of the shape) indexed by y * width + x, and the visited
+    cells as a bitset
     """
 
-    def __init__(self, conf: Config):
+    def __init__(self, conf: Config, rng: random.Random | None = None):
         self.width = conf.width
         self.height = conf.height
         self.entry = conf.entry
         self.exit = conf.exit
         self.output_file = conf.output_file
         self.is_perfect = conf.perfect
+        self.algorithm = conf.algorithm
         if (conf.seed):
             self.seed = conf.seed
         else:
             self.seed = random.randint(0, 2**32 - 1)
-        random.seed(self.seed)
-        self.visited: list[list[int]]
+        if rng is None:
+            rng = random.Random()
+        rng.seed(self.seed)
+        self.rng: random.Random = rng
+        self.visited: BitSet
         self.shape = conf.shape
-        self.lst_repr = [[15 for i in range(self.width)]
-                         for j in range(self.height)]
+        self.lst_repr: array = new_grid(self.width * self.height)
+        self.path: str | None = None
+        self.parents: bytearray | None = None
+        self.journal: list[int] | None = None
+
+    def index(self, pos: tuple[int, int]) -> int:
+        """
+        takes a pos (pos[x, y]) and return its index in the flat grid
+        """
+        return pos[1] * self.width + pos[0]
+
+    def step(self, i: int, direction: int) -> int:
+        """
+        return the index of the cell next to i in the given direction
+        """
+        if direction == 0:
+            return i - self.width
+        if direction == 1:
+            return i + 1
+        if direction == 2:
+            return i + self.width
+        return i - 1
 
     def disalign(self) -> None:
         """
         disalign entry and exit if they are on the same cell
         """
-        direction: int = self.neighbors(self.entry)[0]
+        direction: int = self.neighbors(self.index(self.entry))[0]
         match direction:
             case 0:
                 self.exit = (self.entry[0], self.entry[1] - 1)
@@ -128,24 +206,24 @@ exit has been moved")
         """
         force entry and exit inside the maze in case of special shape
         """
-        while self.lst_repr[self.entry[1]][self.entry[0]] == -1:
+        while self.lst_repr[self.index(self.entry)] == -1:
             if self.entry[0] < self.width // 2:
                 self.entry = (self.entry[0] + 1, self.entry[1])
             else:
                 self.entry = (self.entry[0] - 1, self.entry[1])
-            if self.lst_repr[self.entry[1]][self.entry[0]] != -1:
+            if self.lst_repr[self.index(self.entry)] != -1:
                 continue
             if self.entry[1] < self.height // 2:
                 self.entry = (self.entry[0], self.entry[1] + 1)
             else:
                 self.entry = (self.entry[0], self.entry[1] - 1)
 
-        while self.lst_repr[self.exit[1]][self.exit[0]] == -1:
+        while self.lst_repr[self.index(self.exit)] == -1:
             if self.exit[0] < self.width // 2:
                 self.exit = (self.exit[0] + 1, self.exit[1])
             else:
                 self.exit = (self.exit[0] - 1, self.exit[1])
-            if self.lst_repr[self.exit[1]][self.exit[0]] != -1:
+            if self.lst_repr[self.index(self.exit)] != -1:
                 continue
             if self.exit[1] < self.height // 2:
                 self.exit = (self.exit[0], self.exit[1] + 1)
@@ -159,24 +237,24 @@ exit has been moved")
         """
         force entry and exit inside the maze in case of donut
         """
-        while self.lst_repr[self.entry[1]][self.entry[0]] == -1:
+        while self.lst_repr[self.index(self.entry)] == -1:
             if self.entry[0] > self.width // 2:
                 self.entry = (self.entry[0] + 1, self.entry[1])
             else:
                 self.entry = (self.entry[0] - 1, self.entry[1])
-            if self.lst_repr[self.entry[1]][self.entry[0]] != -1:
+            if self.lst_repr[self.index(self.entry)] != -1:
                 continue
             if self.entry[1] > self.height // 2:
                 self.entry = (self.entry[0], self.entry[1] + 1)
             else:
                 self.entry = (self.entry[0], self.entry[1] - 1)
 
-        while self.lst_repr[self.exit[1]][self.exit[0]] == -1:
+        while self.lst_repr[self.index(self.exit)] == -1:
             if self.exit[0] > self.width // 2:
                 self.exit = (self.exit[0] + 1, self.exit[1])
             else:
                 self.exit = (self.exit[0] - 1, self.exit[1])
-            if self.lst_repr[self.exit[1]][self.exit[0]] != -1:
+            if self.lst_repr[self.index(self.exit)] != -1:
                 continue
             if self.exit[1] > self.height // 2:
                 self.exit = (self.exit[0], self.exit[1] + 1)
@@ -205,9 +283,7 @@ exit has been moved")
         donut
         ellipse
         """
-        self.visited = [[0 for i in range(self.width)]
-                        for j in range(self.height)]
-        center: tuple[int, int]
+        self.visited = BitSet(self.width * self.height)
         if self.shape == "rectangle":
             return
 
@@ -218,48 +294,24 @@ exit has been moved")
                 self.project_in_square(size)
 
             self.width, self.height = size, size
-            self.lst_repr = [[15 for i in range(self.width)]
-                             for j in range(self.height)]
-            self.visited = [[0 for i in range(self.width)]
-                            for j in range(self.height)]
+            self.lst_repr = new_grid(size * size)
+            self.visited = BitSet(size * size)
 
         if self.shape in ["circle", "donut"]:
-            center = (size // 2, size // 2)
-            for line in range(size):
-                for col in range(size):
-                    if sqrt((center[0] - line)**2 + (center[1] - col)**2) \
-                            > size // 2:
-                        self.lst_repr[line][col] = -1
-                        self.visited[line][col] = -1
+            apply_mask(self.lst_repr, self.visited, "circle", size, size)
             self.project_in()
 
         if self.shape == "donut":
-            center = (size // 2, size // 2)
-            for line in range(size):
-                for col in range(size):
-                    if sqrt((center[0] - line)**2 + (center[1] - col)**2) \
-                            < size // 5:
-                        self.lst_repr[line][col] = -1
-                        self.visited[line][col] = -1
+            apply_mask(self.lst_repr, self.visited, "hole", size, size)
             self.project_out()
 
         if self.shape == "diamond":
-            center = (size // 2, size // 2)
-            for line in range(size):
-                for col in range(size):
-                    if AStar.dist(center, (col, line)) > size // 2:
-                        self.lst_repr[line][col] = -1
-                        self.visited[line][col] = -1
+            apply_mask(self.lst_repr, self.visited, "diamond", size, size)
             self.project_in()
 
         if self.shape == "ellipse":
-            center = (self.width // 2, self.height // 2)
-            for line in range(self.height):
-                for col in range(self.width):
-                    if (col - center[0]) ** 2 / center[0] ** 2 + \
-                       (line - center[1]) ** 2 / center[1] ** 2 > 1:
-                        self.lst_repr[line][col] = -1
-                        self.visited[line][col] = -1
+            apply_mask(self.lst_repr, self.visited, "ellipse",
+                       self.width, self.height)
             self.project_in()
 
     def ft_stamp(self, error: bool) -> None:
@@ -300,8 +352,8 @@ exit has been moved")
  in the logo)")
                 return
         for coord in stamp:
-            self.visited[coord[1]][coord[0]] = 1
-            self.lst_repr[coord[1]][coord[0]] = 15
+            self.visited.add(self.index(coord))
+            self.lst_repr[self.index(coord)] = 15
 
     @staticmethod
     def hexa(x: int) -> str:
@@ -317,42 +369,87 @@ exit has been moved")
         except Exception:
             return " "
 
+    def hexa_rows(self) -> Iterator[bytes]:
+        """
+        yields the hexadecimal representation of the grid row by row
+        built with a translation table instead of one hexa call per cell
+        """
+        for start in range(0, len(self.lst_repr), self.width):
+            yield self.lst_repr[start:start + self.width].tobytes() \
+                .translate(HEXA_TABLE)
+
+    def grid_repr(self) -> str:
+        """
+        returns the hexadecimal representation of the grid, one line per row
+        """
+        return b"".join(row + b"\n" for row in self.hexa_rows()).decode()
+
+    def solution(self, error: bool) -> str:
+        """
+        returns the solution of the maze, solving it only on the first call
+        """
+        if self.path is None:
+            try:
+                self.path = self.solve()
+            except (TypeError):
+                if error:
+                    print("Maze with no solution cannot be represented")
+                return " "
+        return self.path
+
     def str_repr(self, error: bool) -> str:
         """
         returns a representation of the maze and it s solution as a string
         """
-        repr = ""
-        for i in self.lst_repr:
-            for j in i:
-                repr += self.hexa(j)
-            repr += "\n"
-        repr += f"\n{self.entry[0]},{self.entry[1]}\n\
-{self.exit[0]},{self.exit[1]}\n"
-        try:
-            repr += self.solve()
-        except (TypeError):
-            if error:
-                print("Maze with no solution cannot be represented")
-            repr += " "
-        return repr
+        return self.grid_repr() + self.footer(self.solution(error)).decode()
+
+    def export(self) -> Maze:
+        """
+        export the maze in the output file and as an object for further
+        treatment, both from the same representation and solution
+        """
+        grid: str = self.grid_repr()
+        path: str = self.solution(True)
+        with open_maze_file(self.output_file) as f:
+            f.write(grid.encode())
+            f.write(self.footer(path))
+        return self.maze_obj(grid, path)
 
     def export_maze_file(self) -> None:
         """
         export the list representation of the maze in a .txt file
+        the grid is streamed row by row, the file is compressed if its name
+        ends with .gz, .xz or .lzma
         """
-        with open(self.output_file, "w") as f:
-            f.write(self.str_repr(True))
+        path: str = self.solution(True)
+        with open_maze_file(self.output_file) as f:
+            for row in self.hexa_rows():
+                f.write(row)
+                f.write(b"\n")
+            f.write(self.footer(path))
+
+    def footer(self, path: str) -> bytes:
+        """
+        returns the entry, exit and solution lines following the grid
+        """
+        return f"\n{self.entry[0]},{self.entry[1]}\n\
+{self.exit[0]},{self.exit[1]}\n{path}".encode()
 
     def export_maze_obj(self) -> Maze:
         """
         export the maze as an object for further treatment
         """
-        repr = self.str_repr(False)
-        return Maze(
-            maze=repr[:(self.width + 1) * self.height],
+        return self.maze_obj(self.grid_repr(), self.solution(False))
+
+    def maze_obj(self, grid: str, path: str) -> Maze:
+        """
+        build the Maze object from the grid representation and solution
+        """
+        return Maze.trusted(
+            maze=grid,
             entry=self.entry,
             exit=self.exit,
-            path=repr.splitlines()[self.height + 3],
+            path=path,
             nbr_cols=self.width,
             nbr_rows=self.height,
             seed=self.seed
@@ -362,44 +459,56 @@ exit has been moved")
         """
         solve the maze
         return a string representing mooves necessary to solve it
+        perfect mazes dug by the dfs are solved from their parent directions,
+        the others with A* over their junction graph
         """
-        solver: AStar = AStar(self)
-        solution: str | None = solver.solve(self)
+        solution: str | None = None
+        if self.is_perfect and self.parents is not None:
+            solution = TreeSolver(self).solve(self)
+        if not solution:
+            solution = JunctionGraph.of(self).solve(self.entry, self.exit)
         if not solution:
             raise Exception("an error occured, the maze has no solution")
         return solution
 
-    def dig_wall(self, pos: tuple[int, int], direction: int) -> None:
+    def dig_wall(self, i: int, direction: int) -> None:
         """
-        given a pos and a dirrection,
+        given a cell index and a dirrection,
         removes the wall between a position and the destination
         """
-        if direction == 0 and self.lst_repr[pos[1]][pos[0]] & 1:
-            self.lst_repr[pos[1]][pos[0]] -= 1
-            self.lst_repr[pos[1] - 1][pos[0]] -= 4
-        elif direction == 1 and self.lst_repr[pos[1]][pos[0]] & 2:
-            self.lst_repr[pos[1]][pos[0]] -= 2
-            self.lst_repr[pos[1]][pos[0] + 1] -= 8
-        elif direction == 2 and self.lst_repr[pos[1]][pos[0]] & 4:
-            self.lst_repr[pos[1]][pos[0]] -= 4
-            self.lst_repr[pos[1] + 1][pos[0]] -= 1
-        elif direction == 3 and self.lst_repr[pos[1]][pos[0]] & 8:
-            self.lst_repr[pos[1]][pos[0]] -= 8
-            self.lst_repr[pos[1]][pos[0] - 1] -= 2
-
-    def neighbors(self, pos: tuple[int, int]) -> list[int]:
-        """
-        takes a pos in the currently generating maze (pos[x, y])
+        if direction == 0 and self.lst_repr[i] & 1:
+            self.lst_repr[i] -= 1
+            self.lst_repr[i - self.width] -= 4
+        elif direction == 1 and self.lst_repr[i] & 2:
+            self.lst_repr[i] -= 2
+            self.lst_repr[i + 1] -= 8
+        elif direction == 2 and self.lst_repr[i] & 4:
+            self.lst_repr[i] -= 4
+            self.lst_repr[i + self.width] -= 1
+        elif direction == 3 and self.lst_repr[i] & 8:
+            self.lst_repr[i] -= 8
+            self.lst_repr[i - 1] -= 2
+        if self.journal is not None:
+            self.journal.append(i)
+            self.journal.append(self.step(i, direction))
+
+    def neighbors(self, i: int) -> list[int]:
+        """
+        takes a cell index in the currently generating maze
         return the list of unexplored neighbors
         """
         output = []
-        if pos[0] - 1 >= 0 and self.visited[pos[1]][pos[0] - 1] == 0:
+        x: int = i % self.width
+        w: int = self.width
+        bits: bytearray = self.visited.bits
+        if x - 1 >= 0 and not bits[(i - 1) >> 3] >> ((i - 1) & 7) & 1:
             output.append(3)
-        if pos[0] + 1 < self.width and self.visited[pos[1]][pos[0] + 1] == 0:
+        if x + 1 < w and not bits[(i + 1) >> 3] >> ((i + 1) & 7) & 1:
             output.append(1)
-        if pos[1] - 1 >= 0 and self.visited[pos[1] - 1][pos[0]] == 0:
+        if i - w >= 0 and not bits[(i - w) >> 3] >> ((i - w) & 7) & 1:
             output.append(0)
-        if pos[1] + 1 < self.height and self.visited[pos[1] + 1][pos[0]] == 0:
+        if i + w < len(self.lst_repr) and \
+                not bits[(i + w) >> 3] >> ((i + w) & 7) & 1:
             output.append(2)
         return output
 
@@ -408,15 +517,16 @@ exit has been moved")
         removes random walls in the maze before generation in case of unperfect
         maze
         """
-        nb_remove: int = int(sqrt(random.randint(1, self.height * self.width)))
+        nb_remove: int = int(sqrt(self.rng.randint(1,
+                                                   self.height * self.width)))
         i: int = 0
-        current: tuple[int, int]
+        current: int
         while (i < nb_remove + 5):
-            current = (random.randint(0, self.width - 1),
-                       random.randint(0, self.height - 1))
-            if not self.visited[current[1]][current[0]]:
+            current = self.index((self.rng.randint(0, self.width - 1),
+                                  self.rng.randint(0, self.height - 1)))
+            if not self.visited[current]:
                 neighbors: list[int] = self.neighbors(current)
-                random.shuffle(neighbors)
+                self.rng.shuffle(neighbors)
                 self.dig_wall(current, neighbors[0])
             i += 1
 
@@ -424,74 +534,132 @@ exit has been moved")
         """
         removes hole larger than 2*3 by filling the center with 3 walls
         """
+        grid: array = self.lst_repr
+        w: int = self.width
         for line in range(1, self.height - 1):
-            for col in range(1, self.width - 1):
-                if self.lst_repr[line][col] == 0 and \
-                    not (self.lst_repr[line - 1][col] & 8 or
-                         self.lst_repr[line - 1][col] & 2) and \
-                    not (self.lst_repr[line][col - 1] & 1 or
-                         self.lst_repr[line][col - 1] & 4) and \
-                    not (self.lst_repr[line + 1][col] & 8 or
-                         self.lst_repr[line + 1][col] & 2) and \
-                    not (self.lst_repr[line][col + 1] & 1 or
-                         self.lst_repr[line][col + 1] & 4):
-                    self.lst_repr[line][col] = random.choice([7, 11, 13, 15])
-                    if self.lst_repr[line][col] & 1:
-                        self.lst_repr[line - 1][col] += 4
-                    if self.lst_repr[line][col] & 2:
-                        self.lst_repr[line][col + 1] += 8
-                    if self.lst_repr[line][col] & 4:
-                        self.lst_repr[line + 1][col] += 1
-                    if self.lst_repr[line][col] & 8:
-                        self.lst_repr[line][col - 1] += 2
+            for i in range(line * w + 1, line * w + w - 1):
+                if grid[i] == 0 and \
+                    not (grid[i - w] & 8 or grid[i - w] & 2) and \
+                    not (grid[i - 1] & 1 or grid[i - 1] & 4) and \
+                    not (grid[i + w] & 8 or grid[i + w] & 2) and \
+                        not (grid[i + 1] & 1 or grid[i + 1] & 4):
+                    grid[i] = self.rng.choice([7, 11, 13, 15])
+                    if grid[i] & 1:
+                        grid[i - w] += 4
+                    if grid[i] & 2:
+                        grid[i + 1] += 8
+                    if grid[i] & 4:
+                        grid[i + w] += 1
+                    if grid[i] & 8:
+                        grid[i - 1] += 2
+                    if self.journal is not None:
+                        self.journal += (i, i - w, i + 1, i + w, i - 1)
+
+    def generate(self) -> None:
+        """
+        generate the maze with the algorithm selected in the config
+        """
+        if self.algorithm == "eller":
+            self.eller()
+        else:
+            self.carve(GENERATORS[self.algorithm])
 
-    def dfs(self) -> None:
+    def eller(self) -> None:
         """
-        uses randomized depth first search algorithm to genarate th maze
+        uses eller's algorithm to generate a perfect rectangle maze row by
+        row (the 42 logo cannot be represented)
+        """
+        self.path = None
+        self.parents = None
+        self.shape_stamp()
+        for y, row in enumerate(eller_rows(self.width, self.height, self.rng)):
+            self.lst_repr[y * self.width:(y + 1) * self.width] = row
+
+    def carve(self, generator: type[Generator]) -> None:
+        """
+        stamp the shape and the 42 logo, scramble the maze if it is not
+        perfect, then let the generator dig it
         """
+        self.path = None
+        self.parents = None
         self.shape_stamp()
         self.ft_stamp(True)
 
         if not self.is_perfect:
             self.scramble()
 
-        pos: list[tuple[int, int]] = [self.entry]
-        while pos:
-            self.visited[pos[-1][1]][pos[-1][0]] = 1
-            if pos[-1] == self.exit:
-                pos.pop()
-                continue
-            neighbors: list[int] = self.neighbors(pos[-1])
-            if not neighbors:
-                pos.pop()
-                continue
-
-            random.shuffle(neighbors)
-            self.dig_wall(pos[-1], neighbors[0])
-            if neighbors[0] == 0:
-                pos.append((pos[-1][0], pos[-1][1] - 1))
-            if neighbors[0] == 1:
-                pos.append((pos[-1][0] + 1, pos[-1][1]))
-            if neighbors[0] == 2:
-                pos.append((pos[-1][0], pos[-1][1] + 1))
-            if neighbors[0] == 3:
-                pos.append((pos[-1][0] - 1, pos[-1][1]))
+        generator(self).carve()
         self.remove_square_holes()
 
+    def generate_steps(self, batch: int) -> Iterator[list[int]]:
+        """
+        generate the maze like generate, pausing every batch dug walls (every
+        row for eller) to yield the cells changed since the last pause
+        the first pause comes once the shape and the 42 logo are stamped,
+        the whole grid has changed then
+        """
+        self.journal = []
+        try:
+            self.path = None
+            self.parents = None
+            self.shape_stamp()
+            if self.algorithm == "eller":
+                for y, row in enumerate(eller_rows(self.width, self.height,
+                                                   self.rng)):
+                    self.lst_repr[y * self.width:(y + 1) * self.width] = row
+                    yield list(range(y * self.width, (y + 1) * self.width))
+                return
+            self.ft_stamp(True)
+            if not self.is_perfect:
+                self.scramble()
+            yield self.flush()
+            generator: Generator = GENERATORS[self.algorithm](self)
+            for count, _ in enumerate(generator.steps(), 1):
+                if count % batch == 0:
+                    yield self.flush()
+            self.remove_square_holes()
+            yield self.flush()
+        finally:
+            self.journal = None
+
+    def flush(self) -> list[int]:
+        """
+        returns the cells changed since the last call and empties the journal
+        """
+        changed: list[int] = self.journal or []
+        self.journal = []
+        return changed
+
+    def dfs(self) -> None:
+        """
+        uses randomized depth first search algorithm to genarate th maze
+        """
+        self.carve(DFSGenerator)
+
 
 class AStar:
     """
     AStar is a class that aims to solve mazes generated with the MazeGen obj
     it must be instanciate before use
     init only takes a maze as a parameter
+    the open set is a binary heap of (f, order, node) entries with lazy
+    deletion, self.order indexes the nodes currently open
+    nodes are flat cell indexes of the maze grid
     """
 
     def __init__(self, maze: MazeGen):
-        self.open = [maze.entry]
-        self.closed: set[tuple[int, int]] = set()
-        self.came_from: dict[tuple[int, int], tuple[int, int]] = dict()
-        self.g = {maze.entry: 0}
-        self.f = {maze.entry: self.dist(maze.entry, maze.exit)}
+        self.width: int = maze.width
+        self.goal: tuple[int, int] = maze.exit
+        entry: int = maze.index(maze.entry)
+        self.open: list[tuple[int, int, int]] = []
+        self.order: dict[int, int] = dict()
+        self.counter: int = 0
+        self.closed: set[int] = set()
+        self.came_from: dict[int, int] = dict()
+        self.g = {entry: 0}
+        self.found: bool = False
+        self.f = {entry: self.dist(maze.entry, maze.exit)}
+        self.open_node(entry)
 
     @staticmethod
     def dist(src: tuple[int, int], dest: tuple[int, int]) -> int:
@@ -500,50 +668,70 @@ class AStar:
         """
         return abs(src[0] - dest[0]) + abs(src[1] - dest[1])
 
+    def h(self, node: int) -> int:
+        """
+        manathan distance between a node and the exit
+        """
+        y, x = divmod(node, self.width)
+        return abs(x - self.goal[0]) + abs(y - self.goal[1])
+
     @staticmethod
-    def neighbors(maze: MazeGen, pos: tuple[int, int]) \
-            -> list[tuple[int, int]]:
+    def neighbors(maze: MazeGen, pos: int) -> list[int]:
         """
-        return the coordinate of the avaible neighbors from 'pos' cell
+        return the index of the avaible neighbors from 'pos' cell
         """
-        neighbors_coords: list[tuple[int, int]] = []
-        walls: int = maze.lst_repr[pos[1]][pos[0]]
+        neighbors_idx: list[int] = []
+        walls: int = maze.lst_repr[pos]
 
         if not walls & 1:
-            neighbors_coords.append((pos[0], pos[1] - 1))
+            neighbors_idx.append(pos - maze.width)
         if not walls & 2:
-            neighbors_coords.append((pos[0] + 1, pos[1]))
+            neighbors_idx.append(pos + 1)
         if not walls & 4:
-            neighbors_coords.append((pos[0], pos[1] + 1))
+            neighbors_idx.append(pos + maze.width)
         if not walls & 8:
-            neighbors_coords.append((pos[0] - 1, pos[1]))
-        return neighbors_coords
+            neighbors_idx.append(pos - 1)
+        return neighbors_idx
+
+    def open_node(self, node: int) -> None:
+        """
+        push a node in the open heap with its current f value
+        a node already open keeps its insertion order so ties are broken
+        the same way as before
+        """
+        if node not in self.order:
+            self.order[node] = self.counter
+            self.counter += 1
+        heappush(self.open, (self.f[node], self.order[node], node))
 
-    def best_node(self) -> tuple[int, int]:
+    def best_node(self) -> int | None:
         """
         finds the node with the lowest f value
+        outdated heap entries are dropped on the way
         """
-        best_node = self.open[0]
-        for node in self.open[1:]:
-            if self.f[best_node] > self.f[node]:
-                best_node = node
-        return best_node
+        while self.open:
+            f, _, node = self.open[0]
+            if node in self.order and self.f[node] == f:
+                return node
+            heappop(self.open)
+        return None
 
-    def close_node(self, current: tuple[int, int]) -> None:
+    def close_node(self, current: int) -> None:
         """
         shift my current node from self.open to self.closed
+        current must be the node just returned by best_node
         """
-        self.open.remove(current)
+        heappop(self.open)
+        del self.order[current]
         self.closed.add(current)
 
-    def compare_paths(self, current: tuple[int, int], next: tuple[int, int]) \
-            -> bool:
+    def compare_paths(self, current: int, next: int) -> bool:
         """
         takes in a node and where we are trying to establish a path from
         and return true if the path should be established
         (true if no path to this cell exists or if it exists and is longer)
         """
-        if next not in self.open and next not in self.g:
+        if next not in self.order and next not in self.g:
             return True
         if self.g[next] > self.g[current] + 1:
             return True
@@ -554,40 +742,64 @@ class AStar:
         finds a path from entry to exit
         puts every explored path in self.came_from
         """
-        current: tuple[int, int]
-        while self.open:
+        for _ in self.expand(maze):
+            pass
+        return self.found
+
+    def solve_steps(self, maze: MazeGen, batch: int) -> Iterator[list[int]]:
+        """
+        solve the maze like solve_paths, yielding the closed nodes every batch
+        nodes, self.found tells if the exit was reached once it is exhausted
+        """
+        closed: list[int] = []
+        for node in self.expand(maze):
+            closed.append(node)
+            if len(closed) == batch:
+                yield closed
+                closed = []
+        yield closed
+
+    def expand(self, maze: MazeGen) -> Iterator[int]:
+        """
+        runs the A* search, yielding every node once it is closed
+        self.found is set when the exit is closed
+        """
+        current: int | None
+        self.found = False
+        while True:
             current = self.best_node()
+            if current is None:
+                return
             self.close_node(current)
-            if current == maze.exit:
-                return True
+            yield current
+            if current == maze.index(maze.exit):
+                self.found = True
+                return
             neighbors = self.neighbors(maze, current)
             for node in neighbors:
                 if node in self.closed:
                     continue
                 if self.compare_paths(current, node):
-                    if node not in self.open:
-                        self.open.append(node)
                     self.g[node] = self.g[current] + 1
-                    self.f[node] = self.g[node] + \
-                        self.dist(node, maze.exit)
+                    self.f[node] = self.g[node] + self.h(node)
                     self.came_from[node] = current
-        return False
+                    self.open_node(node)
 
     def find_path(self, maze: MazeGen) -> str:
         """
         parse the came_from dict to find the best path from entry to exit
         """
         output: str = ""
-        current: tuple[int, int] = maze.exit
+        current: int = maze.index(maze.exit)
         while current in self.came_from:
-            if self.came_from[current][0] > current[0]:
-                output += "W"
-            elif self.came_from[current][0] < current[0]:
-                output += "E"
-            elif self.came_from[current][1] > current[1]:
+            if self.came_from[current] == current + self.width:
                 output += "N"
-            elif self.came_from[current][1] < current[1]:
+            elif self.came_from[current] == current - self.width:
                 output += "S"
+            elif self.came_from[current] > current:
+                output += "W"
+            elif self.came_from[current] < current:
+                output += "E"
             current = self.came_from[current]
         return output[::-1]
 
@@ -601,3 +813,42 @@ class AStar:
             return self.find_path(maze)
         else:
             return None
+
+
+class TreeSolver:
+    """
+    TreeSolver solves the perfect mazes dug by the dfs without any search
+    the dfs tree is rooted at the entry and maze.parents holds the direction
+    of the parent of every dug cell, so the path is the chain of parents
+    from the exit, read backward, in time proportional to its length
+    """
+
+    MOVES: bytes = bytes.maketrans(b"\x00\x01\x02\x03", b"SWNE")
+
+    def __init__(self, maze: MazeGen):
+        self.width: int = maze.width
+        self.parents: bytearray | None = maze.parents
+
+    def solve(self, maze: MazeGen) -> str | None:
+        """
+        walks up the parents from the exit to the entry
+        output the solution from entry in a string formated with maze notation
+        (N, S, E, W), or None if the exit is not in the tree (every step must
+        cross an open wall)
+        """
+        if self.parents is None:
+            return None
+        offsets: tuple[int, ...] = (-self.width, 1, self.width, -1)
+        grid: array = maze.lst_repr
+        root: int = maze.index(maze.entry)
+        current: int = maze.index(maze.exit)
+        steps: bytearray = bytearray()
+        while current != root:
+            direction: int = self.parents[current]
+            if grid[current] & (1 << direction) \
+                    or len(steps) >= len(self.parents):
+                return None
+            steps.append(direction)
+            current += offsets[direction]
+        steps.reverse()
+        return steps.translate(self.MOVES).decode()
@@ -0,0 +1,105 @@
+from array import array
+from functools import lru_cache
+from importlib.util import find_spec
+from srcs.mazegen.grid import BitSet
+
+HAS_NUMPY: bool = find_spec("numpy") is not None
+
+
+@lru_cache(maxsize=16)
+def shape_mask(kind: str, width: int, height: int) -> tuple[bytes, bytes]:
+    """Compute the cells cut out of a width * height maze by a shape
+
+    Args:
+    kind: circle (outside of the circle), hole (center of the donut),
+    diamond or ellipse
+    width, height: The maze size
+
+    Returns:
+    The mask as one byte per cell (0xFF when cut out, 0 otherwise) and as
+    a little endian bitset
+    """
+    if HAS_NUMPY:
+        return _numpy_mask(kind, width, height)
+    return _python_mask(kind, width, height)
+
+
+def _python_mask(kind: str, width: int, height: int) -> tuple[bytes, bytes]:
+    """Pure Python version of shape_mask, used without numpy"""
+    cells = bytearray(width * height)
+    bits = BitSet(width * height)
+    cx, cy = width // 2, height // 2
+    for line in range(height):
+        for col in range(width):
+            if _is_out(kind, col - cx, line - cy, width, height):
+                cells[line * width + col] = 0xFF
+                bits.add(line * width + col)
+    return bytes(cells), bytes(bits.bits)
+
+
+def _is_out(kind: str, dx: int, dy: int, width: int, height: int) -> bool:
+    """Tell if the cell at (dx, dy) from the center is cut out
+
+    Args:
+    kind: The shape kind
+    dx, dy: Offset of the cell from the center
+    width, height: The maze size
+    """
+    cx, cy = width // 2, height // 2
+    if kind == "circle":
+        return dx * dx + dy * dy > cx * cx
+    if kind == "hole":
+        return dx * dx + dy * dy < (width // 5) ** 2
+    if kind == "diamond":
+        return abs(dx) + abs(dy) > cx
+    if cx == 0 or cy == 0:
+        # A one cell wide ellipse keeps every cell, as numpy gets nan there
+        return False
+    return dx ** 2 / cx ** 2 + dy ** 2 / cy ** 2 > 1
+
+
+def _numpy_mask(kind: str, width: int, height: int) -> tuple[bytes, bytes]:
+    """Vectorized version of shape_mask"""
+    import numpy as np
+    cx, cy = width // 2, height // 2
+    dx = np.arange(width, dtype=np.int64).reshape(1, -1) - cx
+    dy = np.arange(height, dtype=np.int64).reshape(-1, 1) - cy
+    if kind == "circle":
+        out = dx * dx + dy * dy > cx * cx
+    elif kind == "hole":
+        out = dx * dx + dy * dy < (width // 5) ** 2
+    elif kind == "diamond":
+        out = np.abs(dx) + np.abs(dy) > cx
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = dx ** 2 / cx ** 2 + dy ** 2 / cy ** 2 > 1
+    out = out.ravel()
+    return ((out.astype(np.uint8) * 0xFF).tobytes(),
+            np.packbits(out, bitorder="little").tobytes())
+
+
+def apply_mask(grid: array, visited: BitSet, kind: str,
+               width: int, height: int) -> None:
+    """Cut a shape out of the maze in place: cut out cells become -1 in the
+    grid and are marked as visited
+
+    Args:
+    grid: The flat maze grid
+    visited: The visited bitset
+    kind: The shape kind
+    width, height: The maze size
+    """
+    cells, bits = shape_mask(kind, width, height)
+    if HAS_NUMPY:
+        import numpy as np
+        np.frombuffer(grid, dtype=np.int8)[:] |= \
+            np.frombuffer(cells, dtype=np.int8)
+        np.frombuffer(visited.bits, dtype=np.uint8)[:] |= \
+            np.frombuffer(bits, dtype=np.uint8)
+        return
+    raw = memoryview(grid).cast("B")
+    raw[:] = (int.from_bytes(raw, "little") |
+              int.from_bytes(cells, "little")).to_bytes(len(raw), "little")
+    visited.bits[:] = (int.from_bytes(visited.bits, "little") |
+                       int.from_bytes(bits, "little")
+                       ).to_bytes(len(visited.bits), "little")
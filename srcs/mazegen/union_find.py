@@ -0,0 +1,52 @@
+from array import array
+
+
+class UnionFind:
+    """Disjoint sets of cell indexes, stored in flat arrays, with path
+    compression and union by rank
+
+    Args:
+    size: The number of cells
+    """
+
+    __slots__ = ("parent", "rank")
+
+    def __init__(self, size: int) -> None:
+        self.parent = array("I", range(size))
+        self.rank = bytearray(size)
+
+    def find(self, x: int) -> int:
+        """Find the representative of the set containing x
+
+        Args:
+        x: The cell index
+
+        Returns:
+        The representative cell index
+        """
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing a and b
+
+        Args:
+        a, b: The cell indexes
+
+        Returns:
+        False if they already were in the same set
+        """
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        return True